@@ -1,5 +1,12 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class CoreConfig(AppConfig):
     name = 'core'
+
+    def ready(self):
+        from .slow_queries import install
+        from .sqlite import apply_pragmas
+        connection_created.connect(install)
+        connection_created.connect(apply_pragmas)
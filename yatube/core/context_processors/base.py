@@ -0,0 +1,25 @@
+import time
+from functools import wraps
+
+
+def memoized_until(next_change):
+    """Запоминает контекст, который зависит только от времени.
+
+    Функция-процессор вызывается без запроса; её результат живёт в памяти
+    процесса до момента next_change(now), поэтому на рендер остаётся
+    одно сравнение с time.time().
+    """
+    def decorator(compute):
+        state = ({}, float('-inf'))
+
+        @wraps(compute)
+        def processor(request):
+            nonlocal state
+            context, expires = state
+            now = time.time()
+            if now >= expires:
+                context = compute()
+                state = context, next_change(now)
+            return context
+        return processor
+    return decorator
@@ -1,7 +1,15 @@
 import datetime
 
+from .base import memoized_until
 
-def year(request):
+
+def _next_year(now):
+    year = datetime.date.fromtimestamp(now).year
+    return datetime.datetime(year + 1, 1, 1).timestamp()
+
+
+@memoized_until(_next_year)
+def year():
     """Добавляет переменную с текущим годом."""
     return {
         'year': datetime.date.today().year
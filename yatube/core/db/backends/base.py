@@ -0,0 +1,65 @@
+import os
+
+from ..pool import PoolExhausted, get_pool, keep_inherited
+
+
+class PooledDatabaseWrapperMixin:
+    """Берёт соединения из пула процесса вместо того, чтобы открывать их.
+
+    Django закрывает соединение в конце запроса (CONN_MAX_AGE = 0), а
+    обёртка возвращает его в пул, откатив незавершённую транзакцию.
+    Размер и ожидание задаются ключом POOL в настройках базы:
+    {'MAX_SIZE': 10, 'TIMEOUT': 5}.
+
+    Соединение возвращается в тот пул, из которого взято. Если обёртка
+    пережила fork, соединение принадлежит родителю и просто забывается.
+    """
+
+    reused_connection = False
+    connection_pool = None
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        try:
+            raw, self.reused_connection = pool.checkout(
+                lambda: super(
+                    PooledDatabaseWrapperMixin, self
+                ).get_new_connection(conn_params),
+                self.check_connection,
+            )
+        except PoolExhausted as error:
+            raise self.Database.OperationalError(str(error)) from error
+        self.connection_pool = pool
+        return raw
+
+    def check_connection(self, raw):
+        """Проверка свободного соединения перед выдачей из пула."""
+        try:
+            cursor = raw.cursor()
+            cursor.execute('SELECT 1')
+            cursor.close()
+        except self.Database.Error:
+            return False
+        return True
+
+    def _close(self):
+        raw, pool = self.connection, self.connection_pool
+        self.connection_pool = None
+        if pool is None or pool.pid != os.getpid():
+            # Ни откат, ни закрытие не должны дойти до сокета родителя.
+            keep_inherited(raw)
+            return
+        if self.in_atomic_block:
+            # Закрытие посреди atomic: состояние соединения неизвестно.
+            pool.discard(raw)
+            return
+        try:
+            raw.rollback()
+        except self.Database.Error:
+            pool.discard(raw)
+        else:
+            pool.release(raw)
@@ -0,0 +1,11 @@
+from django.db.backends.postgresql import base
+
+from ..base import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    """PostgreSQL с пулом: ENGINE = 'core.db.backends.postgresql'."""
+
+    def check_connection(self, raw):
+        # Разорванное сервером соединение psycopg2 помечает само.
+        return not raw.closed and super().check_connection(raw)
@@ -0,0 +1,168 @@
+import os
+import threading
+import time
+from collections import deque
+
+from ..metrics import Counter, Gauge, Histogram, register
+
+# Пулы процесса по ключу pool_key: у каждого воркера свои соединения.
+pools = {}
+# Пулы и соединения, унаследованные при fork: они принадлежат родителю, и
+# закрывать их (в том числе сборщиком мусора) дочернему процессу нельзя.
+_inherited = []
+_pools_lock = threading.Lock()
+
+POOL_EVENTS = register(Counter(
+    'yatube_db_pool_events_total',
+    'События пулов соединений: выдачи, ожидания, отказы, замены.', 'event'
+))
+POOL_WAIT_SECONDS = register(Histogram(
+    'yatube_db_pool_wait_seconds',
+    'Ожидание свободного соединения в пуле.', 'pool'
+))
+
+
+def _pool_states():
+    states = {}
+    for pool in list(pools.values()):
+        states[f'{pool.name}:in_use'] = pool.in_use
+        states[f'{pool.name}:idle'] = len(pool.idle)
+        states[f'{pool.name}:waiting'] = pool.waiting
+        states[f'{pool.name}:max'] = pool.max_size
+    return states
+
+
+register(Gauge(
+    'yatube_db_pool_connections',
+    'Соединения пулов: занятые, свободные, ожидающие и предел.',
+    'pool', _pool_states
+))
+
+
+class PoolExhausted(Exception):
+    """За timeout секунд в пуле не освободилось соединение."""
+
+
+class ConnectionPool:
+    """Ограниченный пул сырых соединений DB-API одного процесса.
+
+    Вместе занятых и свободных соединений не больше max_size. Свободное
+    соединение перед выдачей проверяется функцией check, сломанное
+    закрывается и заменяется новым.
+    """
+
+    def __init__(self, name, max_size, timeout):
+        self.name = name
+        self.max_size = max_size
+        self.timeout = timeout
+        self.pid = os.getpid()
+        self.idle = deque()
+        self.in_use = 0
+        self.waiting = 0
+        self._condition = threading.Condition()
+
+    def _event(self, event):
+        POOL_EVENTS.inc(f'{self.name}:{event}')
+
+    def _can_checkout(self):
+        return self.idle or self.in_use < self.max_size
+
+    def checkout(self, connect, check):
+        """Выдаёт соединение и признак того, что оно взято из пула."""
+        started = time.perf_counter()
+        with self._condition:
+            if not self._can_checkout():
+                self._event('wait')
+                self.waiting += 1
+                try:
+                    ready = self._condition.wait_for(
+                        self._can_checkout, self.timeout
+                    )
+                finally:
+                    self.waiting -= 1
+                if not ready:
+                    self._event('timeout')
+                    raise PoolExhausted(
+                        f'Пул {self.name}: все {self.max_size} соединений '
+                        f'заняты дольше {self.timeout} с.'
+                    )
+            raw = self.idle.pop() if self.idle else None
+            self.in_use += 1
+        POOL_WAIT_SECONDS.observe(self.name, time.perf_counter() - started)
+        self._event('checkout')
+        if raw is not None:
+            if check(raw):
+                return raw, True
+            self._event('discard')
+            self._close(raw)
+        try:
+            raw = connect()
+        except BaseException:
+            self._put_back(None)
+            raise
+        self._event('connect')
+        return raw, False
+
+    def release(self, raw):
+        """Возвращает соединение в пул."""
+        self._put_back(raw)
+
+    def discard(self, raw):
+        """Закрывает соединение, которое нельзя отдавать дальше."""
+        self._event('discard')
+        self._close(raw)
+        self._put_back(None)
+
+    def clear(self):
+        """Закрывает свободные соединения пула."""
+        with self._condition:
+            idle, self.idle = list(self.idle), deque()
+        for raw in idle:
+            self._close(raw)
+
+    def _put_back(self, raw):
+        with self._condition:
+            self.in_use -= 1
+            if raw is not None:
+                self.idle.append(raw)
+            self._condition.notify()
+
+    @staticmethod
+    def _close(raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+
+def pool_key(alias, settings_dict):
+    return (
+        alias, settings_dict['NAME'], settings_dict['HOST'],
+        settings_dict['PORT'], settings_dict['USER'],
+    )
+
+
+def keep_inherited(raw):
+    """Оставляет родителю соединение, которое дочерний процесс получил
+    при fork уже открытым: не закрывает его и не кладёт в свой пул."""
+    with _pools_lock:
+        _inherited.append(raw)
+
+
+def get_pool(alias, settings_dict):
+    """Пул процесса для базы из настроек settings_dict.
+
+    После fork пулы родителя не используются: его соединения остаются
+    ему, а дочерний процесс открывает свои.
+    """
+    key = pool_key(alias, settings_dict)
+    with _pools_lock:
+        pool = pools.get(key)
+        if pool is None or pool.pid != os.getpid():
+            if pool is not None:
+                _inherited.append(pool)
+            options = settings_dict.get('POOL', {})
+            pool = pools[key] = ConnectionPool(
+                alias, options.get('MAX_SIZE', 10), options.get('TIMEOUT', 5)
+            )
+        return pool
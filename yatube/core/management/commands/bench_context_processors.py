@@ -0,0 +1,54 @@
+import datetime
+import json
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core.management.base import BaseCommand
+from django.template import engines
+from django.template.backends.django import DjangoTemplates
+from django.test import RequestFactory
+
+from posts.bench import measure, percentiles
+
+# То, что шаблоны лент берут из контекст-процессоров.
+TEMPLATE = '{{ year }}{{ user.is_authenticated }}'
+YEAR = 'core.context_processors.year.year'
+
+
+def plain_year(request):
+    """Прежний процессор года, без запоминания."""
+    return {'year': datetime.date.today().year}
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет, сколько стоят контекст-процессоры одному рендеру '
+        'ленты: стандартный набор против запомненного года.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=20_000)
+
+    def handle(self, *args, repeat, **options):
+        template_options = settings.TEMPLATES[0]['OPTIONS']
+        processors = [
+            f'{__name__}.plain_year' if path == YEAR else path
+            for path in template_options['context_processors']
+        ]
+        plain = DjangoTemplates({
+            'NAME': 'plain', 'DIRS': [], 'APP_DIRS': False, 'OPTIONS': {
+                **template_options, 'context_processors': processors
+            },
+        }).from_string(TEMPLATE)
+        cached = engines.all()[0].from_string(TEMPLATE)
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        report = {
+            'plain': percentiles(measure(
+                lambda: plain.render({}, request), repeat
+            )),
+            'memoized': percentiles(measure(
+                lambda: cached.render({}, request), repeat
+            )),
+        }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
@@ -0,0 +1,78 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, connections
+from django.test.utils import override_settings
+
+from core.db.pool import POOL_EVENTS, get_pool
+from posts.bench import (
+    benchmark_database, percentiles, run_load, seed, seed_posts
+)
+from posts.models import Post
+from posts.settings import POSTS_PER_PAGE
+
+POOLED_ENGINES = {
+    'sqlite': 'core.db.backends.sqlite3',
+    'postgresql': 'core.db.backends.postgresql',
+}
+EVENTS = ('connect', 'wait', 'timeout', 'discard')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет «запросы» ленты, каждый из которых заканчивается '
+        'закрытием соединения, как при CONN_MAX_AGE = 0: новое '
+        'соединение на запрос против пула core.db.backends.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=2000)
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--pool-size', type=int, default=8)
+
+    def handle(self, **options):
+        with benchmark_database(), override_settings(
+            SQLITE_PRAGMAS=settings.SQLITE_WAL_PRAGMAS
+        ):
+            author_ids, group_ids = seed(10, 2)
+            seed_posts(options['posts'], author_ids, group_ids)
+            base = {**connection.settings_dict, 'CONN_MAX_AGE': 0}
+            connections.close_all()
+            report = {
+                'per_request': self.run('per_request', base, **options),
+                'pooled': self.run('pooled', dict(
+                    base,
+                    ENGINE=POOLED_ENGINES[connection.vendor],
+                    POOL={'MAX_SIZE': options['pool_size'], 'TIMEOUT': 30},
+                ), **options),
+            }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def run(self, alias, settings_dict, requests, concurrency, **options):
+        connections.databases[alias] = settings_dict
+        before = {
+            event: POOL_EVENTS.value(f'{alias}:{event}') for event in EVENTS
+        }
+
+        def call(number):
+            list(Post.objects.using(alias).feed()[:POSTS_PER_PAGE])
+            connections[alias].close()
+
+        try:
+            timings, errors, elapsed = run_load(call, requests, concurrency)
+        finally:
+            get_pool(alias, settings_dict).clear()
+            del connections.databases[alias]
+        report = dict(
+            percentiles(timings),
+            throughput=round(len(timings) / elapsed, 1),
+            errors=errors,
+        )
+        if 'POOL' in settings_dict:
+            report['pool'] = {
+                event: POOL_EVENTS.value(f'{alias}:{event}') - before[event]
+                for event in EVENTS
+            }
+        return report
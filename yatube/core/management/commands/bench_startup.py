@@ -0,0 +1,104 @@
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Скрипт холодного процесса: импорт yatube.wsgi и первый запрос к нему.
+FIRST_REQUEST = '''
+import json, time
+started = time.perf_counter()
+from yatube.wsgi import application
+imported = time.perf_counter()
+from wsgiref.util import setup_testing_defaults
+environ = {'PATH_INFO': %r}
+setup_testing_defaults(environ)
+status = []
+def start_response(code, headers, exc_info=None):
+    status.append(code)
+b''.join(application(environ, start_response))
+print(json.dumps({
+    'status': status[0],
+    'import_ms': (imported - started) * 1000,
+    'request_ms': (time.perf_counter() - imported) * 1000,
+}))
+'''
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет холодный старт рабочего процесса: время до ответа на '
+        'первый запрос и самые дорогие импорты (python -X importtime) '
+        'для каждого профиля настроек.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--settings-modules', nargs='+', default=[
+                'yatube.settings',
+                'yatube.settings_production',
+                'yatube.settings_worker',
+            ]
+        )
+        parser.add_argument('--path', default='/about/author/')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--top', type=int, default=10)
+
+    def handle(self, *args, settings_modules, path, repeat, top, **options):
+        report = {}
+        for module in settings_modules:
+            environment = {
+                **os.environ,
+                'DJANGO_SETTINGS_MODULE': module,
+                'DJANGO_SECRET_KEY': os.environ.get(
+                    'DJANGO_SECRET_KEY', 'bench-startup'
+                ),
+                'DJANGO_ALLOWED_HOSTS': '127.0.0.1',
+            }
+            runs = [self.cold_start(environment, path) for _ in range(repeat)]
+            report[module] = {
+                'status': runs[0]['status'],
+                **{
+                    key: round(statistics.median(
+                        run[key] for run in runs
+                    ), 1)
+                    for key in ('process_ms', 'import_ms', 'request_ms')
+                },
+                'imports': self.slowest_imports(environment, top),
+            }
+            self.stderr.write(f'{module} готово')
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def python(self, environment, *args):
+        return subprocess.run(
+            [sys.executable, *args], env=environment, cwd=settings.BASE_DIR,
+            capture_output=True, text=True, check=True
+        )
+
+    def cold_start(self, environment, path):
+        started = time.perf_counter()
+        result = self.python(environment, '-c', FIRST_REQUEST % path)
+        run = json.loads(result.stdout.splitlines()[-1])
+        run['process_ms'] = (time.perf_counter() - started) * 1000
+        return run
+
+    def slowest_imports(self, environment, top):
+        """Модули верхнего уровня под yatube.wsgi по собственному времени
+        вместе с вложенными импортами, в миллисекундах."""
+        result = self.python(
+            environment, '-X', 'importtime', '-c',
+            'from yatube.wsgi import application'
+        )
+        totals = {}
+        for line in result.stderr.splitlines():
+            match = IMPORT_TIME.match(line)
+            if match and len(match.group(3)) <= 3:
+                totals[match.group(4)] = int(match.group(2)) / 1000
+        slowest = sorted(totals.items(), key=lambda item: -item[1])[:top]
+        return {name: round(total, 1) for name, total in slowest}
@@ -0,0 +1,47 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.models import Task
+from core.tasks import run_due_tasks
+
+
+class Command(BaseCommand):
+    help = (
+        'Выполняет накопившиеся отложенные задачи core.tasks. С --loop '
+        'работает отдельным исполнителем, как поток процесса сервера.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--retry-failed', action='store_true',
+            help='Вернуть в очередь задачи, исчерпавшие попытки.'
+        )
+        parser.add_argument('--loop', action='store_true')
+
+    def handle(self, retry_failed, loop, **options):
+        if retry_failed:
+            returned = Task.objects.filter(
+                attempts__gte=settings.TASKS_MAX_ATTEMPTS
+            ).update(attempts=0, run_after=timezone.now())
+            self.stdout.write(f'Возвращено задач: {returned}')
+        done = self.drain()
+        while loop:
+            time.sleep(settings.TASKS_POLL_SECONDS)
+            done += self.drain()
+        self.stdout.write(f'Выполнено задач: {done}')
+        failed = Task.objects.filter(
+            attempts__gte=settings.TASKS_MAX_ATTEMPTS
+        ).count()
+        if failed:
+            self.stderr.write(f'Задач с исчерпанными попытками: {failed}')
+
+    def drain(self):
+        done = 0
+        while True:
+            batch = run_due_tasks()
+            if not batch:
+                return done
+            done += batch
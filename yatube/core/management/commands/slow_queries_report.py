@@ -0,0 +1,85 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = 'Сводка журнала медленных запросов по отпечаткам запросов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--log', default=settings.SLOW_QUERY_LOG,
+            help='Журнал; ротированные файлы .1, .2 и т.д. читаются тоже.'
+        )
+        parser.add_argument('--top', type=int, default=20)
+        parser.add_argument('--json', action='store_true')
+
+    def handle(self, log, top, **options):
+        report = self.summarize(self.records(log), top)
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            self.write_text(report)
+
+    def summarize(self, records, top):
+        groups = {}
+        for record in records:
+            group = groups.setdefault(record['fingerprint'], {
+                'fingerprint': record['fingerprint'],
+                'normalized': record['normalized'],
+                'count': 0,
+                'total_ms': 0.0,
+                'max_ms': 0.0,
+                'views': set(),
+                'templates': set(),
+                'explain': record['explain'],
+            })
+            group['count'] += 1
+            group['total_ms'] += record['duration_ms']
+            group['max_ms'] = max(group['max_ms'], record['duration_ms'])
+            for key, value in [
+                ('views', record['view']), ('templates', record['template'])
+            ]:
+                if value:
+                    group[key].add(value)
+        report = sorted(
+            groups.values(), key=lambda group: group['total_ms'], reverse=True
+        )[:top]
+        for group in report:
+            group['total_ms'] = round(group['total_ms'], 3)
+            group['mean_ms'] = round(group['total_ms'] / group['count'], 3)
+            group['views'] = sorted(group['views'])
+            group['templates'] = sorted(group['templates'])
+        return report
+
+    def write_text(self, report):
+        for group in report:
+            self.stdout.write(
+                f'{group["fingerprint"]}  всего {group["total_ms"]} мс, '
+                f'{group["count"]} раз, среднее {group["mean_ms"]} мс, '
+                f'максимум {group["max_ms"]} мс'
+            )
+            self.stdout.write(f'  {group["normalized"]}')
+            for key in ['views', 'templates']:
+                if group[key]:
+                    self.stdout.write(f'  {key}: {", ".join(group[key])}')
+            if group['explain']:
+                for line in group['explain'].splitlines():
+                    self.stdout.write(f'    {line}')
+
+    def records(self, log):
+        paths = [log] + [
+            f'{log}.{number}' for number in range(1, 100)
+            if os.path.exists(f'{log}.{number}')
+        ]
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            with open(path, encoding='utf-8') as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
@@ -0,0 +1,43 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = (
+        'Копирует основную базу SQLite в файлы реплик из DATABASE_REPLICAS. '
+        'Позволяет проверить ReplicaRouter локально на двух файлах.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Повторять копирование раз в столько секунд.'
+        )
+
+    def handle(self, *args, interval, **options):
+        primary = connections[DEFAULT_DB_ALIAS]
+        if primary.vendor != 'sqlite':
+            raise CommandError('Основная база — не SQLite.')
+        replicas = [
+            connections[alias] for alias in settings.DATABASE_REPLICAS
+            if connections[alias].vendor == 'sqlite'
+        ]
+        if not replicas:
+            raise CommandError('В DATABASE_REPLICAS нет баз SQLite.')
+        while True:
+            primary.ensure_connection()
+            for replica in replicas:
+                replica.close()
+                target = sqlite3.connect(replica.settings_dict['NAME'])
+                try:
+                    primary.connection.backup(target)
+                finally:
+                    target.close()
+                self.stdout.write(f'{replica.alias} обновлена')
+            if not interval:
+                return
+            time.sleep(interval)
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.templates import warm_templates
+
+
+class Command(BaseCommand):
+    help = (
+        'Компилирует все шаблоны проекта и приложений. Процессы сервера '
+        'делают то же при старте с WARM_TEMPLATES; команда проверяет, что '
+        'все шаблоны компилируются, и показывает, сколько это стоит.'
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        compiled, errors = warm_templates(force=True)
+        elapsed = (time.perf_counter() - started) * 1000
+        for name, error in errors.items():
+            self.stderr.write(f'{name}: {error}')
+        if errors:
+            raise CommandError(f'Не скомпилировано шаблонов: {len(errors)}.')
+        self.stdout.write(self.style.SUCCESS(
+            f'Скомпилировано шаблонов: {compiled} за {elapsed:.0f} мс.'
+        ))
@@ -0,0 +1,166 @@
+import bisect
+import threading
+import time
+from collections import defaultdict
+
+_local = threading.local()
+
+TIME_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+
+class Histogram:
+    def __init__(self, name, documentation, label, buckets=TIME_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._series = defaultdict(
+            lambda: [[0] * (len(buckets) + 1), 0.0]
+        )
+
+    def observe(self, label_value, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series[label_value]
+            series[0][index] += 1
+            series[1] += value
+
+    def samples(self):
+        with self._lock:
+            series = {
+                label: (list(counts), total)
+                for label, (counts, total) in self._series.items()
+            }
+        for label, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            bounds = [str(bound) for bound in self.buckets] + ['+Inf']
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                yield (
+                    f'{self.name}_bucket{{{self.label}="{label}",'
+                    f'le="{bound}"}} {cumulative}'
+                )
+            yield f'{self.name}_sum{{{self.label}="{label}"}} {total}'
+            yield f'{self.name}_count{{{self.label}="{label}"}} {cumulative}'
+
+    def render(self):
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} histogram',
+            *self.samples(),
+        ]
+
+
+class Counter:
+    def __init__(self, name, documentation, label):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self._lock = threading.Lock()
+        self._values = defaultdict(int)
+
+    def inc(self, label_value, amount=1):
+        with self._lock:
+            self._values[label_value] += amount
+
+    def value(self, label_value):
+        return self._values[label_value]
+
+    def render(self):
+        with self._lock:
+            values = sorted(self._values.items())
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} counter',
+            *(
+                f'{self.name}{{{self.label}="{label}"}} {value}'
+                for label, value in values
+            ),
+        ]
+
+
+class Gauge:
+    """Значения снимаются функцией collect в момент выдачи метрик."""
+
+    def __init__(self, name, documentation, label, collect):
+        self.name = name
+        self.documentation = documentation
+        self.label = label
+        self.collect = collect
+
+    def render(self):
+        return [
+            f'# HELP {self.name} {self.documentation}',
+            f'# TYPE {self.name} gauge',
+            *(
+                f'{self.name}{{{self.label}="{label}"}} {value}'
+                for label, value in sorted(self.collect().items())
+            ),
+        ]
+
+
+registry = []
+
+
+def register(metric):
+    registry.append(metric)
+    return metric
+
+
+def render_metrics():
+    return '\n'.join(
+        line for metric in registry for line in metric.render()
+    ) + '\n'
+
+
+REQUEST_SECONDS = register(Histogram(
+    'yatube_request_seconds', 'Полное время обработки запроса.', 'view'
+))
+DB_SECONDS = register(Histogram(
+    'yatube_db_seconds', 'Время SQL-запросов за один запрос.', 'view'
+))
+DB_QUERIES = register(Histogram(
+    'yatube_db_queries', 'Число SQL-запросов за один запрос.', 'view',
+    COUNT_BUCKETS
+))
+TEMPLATE_SECONDS = register(Histogram(
+    'yatube_template_seconds', 'Время рендеринга шаблонов за запрос.', 'view'
+))
+
+
+class Recorder:
+    """Замеры одного запроса, попавшего в выборку."""
+
+    def __init__(self):
+        self.db_seconds = 0.0
+        self.db_queries = 0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.db_queries += 1
+
+
+def current_request():
+    return getattr(_local, 'request', None)
+
+
+def set_request(request):
+    _local.request = request
+
+
+def current_recorder():
+    return getattr(_local, 'recorder', None)
+
+
+def set_recorder(recorder):
+    _local.recorder = recorder
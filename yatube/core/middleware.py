@@ -0,0 +1,75 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .metrics import (
+    DB_QUERIES, DB_SECONDS, REQUEST_SECONDS, TEMPLATE_SECONDS, Recorder,
+    set_recorder, set_request
+)
+from .routers import stick_to_primary
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+
+class RequestMetricsMiddleware:
+    """Собирает время запроса, SQL и шаблонов по имени URL.
+
+    Замеряется только доля запросов METRICS_SAMPLE_RATE, остальные
+    проходят без обёрток. Текущий запрос запоминается всегда: по нему
+    журнал медленных запросов узнаёт представление.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        set_request(request)
+        try:
+            return self.measure(request)
+        finally:
+            set_request(None)
+
+    def measure(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        recorder = Recorder()
+        set_recorder(recorder)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            set_recorder(None)
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        REQUEST_SECONDS.observe(view, time.perf_counter() - started)
+        DB_SECONDS.observe(view, recorder.db_seconds)
+        DB_QUERIES.observe(view, recorder.db_queries)
+        TEMPLATE_SECONDS.observe(view, recorder.template_seconds)
+        return response
+
+
+class StickyPrimaryMiddleware:
+    """После записи оставляет сессию на основной базе, см. ReplicaRouter.
+
+    Должен стоять после SessionMiddleware и AuthenticationMiddleware:
+    вход пользователя меняет ключ сессии, и окно открывается уже для
+    нового ключа.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if settings.DATABASE_REPLICAS and (
+            request.method not in SAFE_METHODS
+            or getattr(request, '_wrote_primary', False)
+        ):
+            stick_to_primary(request)
+        return response
@@ -0,0 +1,25 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Task(models.Model):
+    """Отложенная задача core.tasks: строка живёт, пока задача не выполнена."""
+
+    name = models.CharField(max_length=200)
+    args = models.TextField(default='[]')
+    # Когда задачу можно брать: время повтора или конец аренды исполнителя.
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ('run_after', 'id')
+        indexes = [
+            models.Index(
+                fields=['run_after', 'id'], name='task_run_after_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.name}{self.args}'
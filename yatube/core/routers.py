@@ -0,0 +1,81 @@
+import random
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .metrics import current_request
+
+
+def _sticky_key(session_key):
+    return f'replica-sticky:{session_key}'
+
+
+def stick_to_primary(request):
+    """Открывает для сессии запроса окно чтения из основной базы.
+
+    Окно хранится в кэше по ключу сессии, поэтому в нескольких процессах
+    оно работает только с общим кэшем.
+    """
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key:
+        cache.set(
+            _sticky_key(session.session_key), True,
+            settings.REPLICA_STICKY_SECONDS
+        )
+
+
+def read_from_primary(request):
+    """Направляет всё дальнейшее чтение запроса в основную базу."""
+    request._reads_replica = False
+
+
+def _reads_replica(request):
+    if hasattr(request, '_reads_replica'):
+        return request._reads_replica
+    match = request.resolver_match
+    if match is None:
+        # До разбора URL (сессия, пользователь в middleware) читаем
+        # из основной базы и решение не запоминаем.
+        return False
+    session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+    request._reads_replica = (
+        request.method in ('GET', 'HEAD')
+        and match.view_name in settings.READ_ONLY_VIEWS
+        and not getattr(request, '_wrote_primary', False)
+        and not (session_key and cache.get(_sticky_key(session_key)))
+    )
+    return request._reads_replica
+
+
+class ReplicaRouter:
+    """Отправляет чтение представлений READ_ONLY_VIEWS на реплики.
+
+    Запись и всё остальное идёт в основную базу. Сессия, которая недавно
+    писала, читает из основной базы REPLICA_STICKY_SECONDS, чтобы видеть
+    свои изменения раньше, чем их получат реплики. Сессии всегда читаются
+    из основной базы.
+    """
+
+    def db_for_read(self, model, **hints):
+        request = current_request()
+        if (
+            not settings.DATABASE_REPLICAS or request is None
+            or model._meta.app_label == 'sessions'
+        ):
+            return None
+        if _reads_replica(request):
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        request = current_request()
+        if request is not None:
+            request._wrote_primary = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,96 @@
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.template.base import Node
+from django.utils import timezone
+
+from .metrics import current_request
+
+logger = logging.getLogger('yatube.slow_queries')
+_local = threading.local()
+
+NUMBERS = re.compile(r'\b\d+\b')
+STRINGS = re.compile(r"'(?:[^']|'')*'")
+PLACEHOLDER_LISTS = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+SPACES = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """Нормализованный текст запроса без литералов и длины списков IN."""
+    sql = STRINGS.sub('?', sql)
+    sql = NUMBERS.sub('?', sql)
+    sql = PLACEHOLDER_LISTS.sub('(...)', sql.replace('%s', '?'))
+    sql = SPACES.sub(' ', sql).strip()
+    return hashlib.md5(sql.encode()).hexdigest()[:12], sql
+
+
+def template_position():
+    """Шаблон и строка тега, во время рендеринга которого идёт запрос."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        node = frame.f_locals.get('self')
+        if (
+            frame.f_code.co_name == 'render_annotated'
+            and isinstance(node, Node)
+            and node.token is not None
+        ):
+            return f'{node.origin.template_name}:{node.token.lineno}'
+        frame = frame.f_back
+    return None
+
+
+def explain(connection, sql, params):
+    if not sql.lstrip().upper().startswith('SELECT'):
+        return None
+    prefix = connection.ops.explain_query_prefix()
+    _local.explaining = True
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f'{prefix} {sql}', params)
+            return '\n'.join(
+                ' '.join(map(str, row)) for row in cursor.fetchall()
+            )
+    except Exception as error:
+        return f'EXPLAIN не удался: {error}'
+    finally:
+        _local.explaining = False
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Обёртка выполнения SQL: пишет в журнал запросы дольше порога."""
+    if getattr(_local, 'explaining', False):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = (time.perf_counter() - started) * 1000
+        if duration >= settings.SLOW_QUERY_THRESHOLD_MS:
+            request = current_request()
+            match = request and request.resolver_match
+            key, normalized = fingerprint(sql)
+            logger.warning(json.dumps({
+                'time': timezone.now().isoformat(),
+                'duration_ms': round(duration, 3),
+                'fingerprint': key,
+                'normalized': normalized,
+                'sql': sql,
+                'params': repr(params)[:1000],
+                'view': match.view_name if match else None,
+                'template': template_position(),
+                'explain': None if many else explain(
+                    context['connection'], sql, params
+                ),
+            }, ensure_ascii=False))
+
+
+def install(sender, connection, **kwargs):
+    """Подключает журнал медленных запросов к новому соединению."""
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
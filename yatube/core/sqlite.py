@@ -0,0 +1,38 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Очередь писателей процесса: SQLite допускает одного писателя на файл,
+# а в режиме WAL читатели пишущим не мешают и не ждут их.
+write_lock = threading.Lock()
+
+
+def apply_pragmas(sender, connection, **kwargs):
+    """Настраивает новое соединение SQLite по SQLITE_PRAGMAS.
+
+    Соединение, взятое из пула, уже настроено.
+    """
+    if connection.vendor != 'sqlite' or getattr(
+        connection, 'reused_connection', False
+    ):
+        return
+    with connection.cursor() as cursor:
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@contextmanager
+def serialized_writes(using=DEFAULT_DB_ALIAS):
+    """Пропускает пишущие блоки процесса к SQLite по одному.
+
+    Вместо того чтобы ждать друг друга в busy_timeout и падать с
+    «database is locked», писатели ждут в очереди на блокировке.
+    Для остальных СУБД ничего не делает.
+    """
+    if connections[using].vendor != 'sqlite':
+        yield
+        return
+    with write_lock:
+        yield
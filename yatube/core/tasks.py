@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+import threading
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .metrics import Counter, register
+from .models import Task
+from .sqlite import serialized_writes
+
+logger = logging.getLogger('yatube.tasks')
+
+# Задачи по имени «модуль.функция», см. task.
+registry = {}
+
+TASKS = register(Counter(
+    'yatube_tasks_total',
+    'Выполнения отложенных задач: успехи, повторы и отказы.', 'task'
+))
+
+
+def task(func):
+    """Регистрирует функцию как задачу и добавляет ей func.delay(*args).
+
+    Изменения задачи в базе фиксируются ровно один раз, вместе со снятием
+    её строки из очереди. Прочие побочные эффекты (кэш) могут
+    повториться и должны быть идемпотентными. Аргументы сохраняются
+    в JSON.
+    """
+    func.task_name = f'{func.__module__}.{func.__name__}'
+    registry[func.task_name] = func
+    func.delay = lambda *args: enqueue(func.task_name, *args)
+    return func
+
+
+def enqueue(name, *args):
+    """Ставит задачу в очередь в текущей транзакции.
+
+    Строка задачи фиксируется вместе с изменениями, которые её вызвали,
+    а исполнитель процесса просыпается после фиксации. С TASKS_EAGER
+    задача выполняется сразу.
+    """
+    if settings.TASKS_EAGER:
+        with transaction.atomic():
+            registry[name](*args)
+        return
+    Task.objects.create(name=name, args=json.dumps(args))
+    transaction.on_commit(worker.wake)
+
+
+def _claim(task_id, run_after):
+    """Берёт задачу в аренду: один исполнитель из всех процессов."""
+    return Task.objects.filter(pk=task_id, run_after=run_after).update(
+        run_after=timezone.now() + timedelta(
+            seconds=settings.TASKS_LEASE_SECONDS
+        ),
+        attempts=F('attempts') + 1,
+    )
+
+
+def _run(task_id, name, args):
+    with serialized_writes(), transaction.atomic():
+        # Строка снимается первой и остаётся заблокированной до фиксации:
+        # исполнитель, взявший задачу после истёкшей аренды, дождётся
+        # его и не найдёт строки. При сбое задача вернётся откатом.
+        if not Task.objects.filter(pk=task_id).delete()[0]:
+            return
+        registry[name](*json.loads(args))
+
+
+def _fail(task_id, name, attempts):
+    logger.exception('Задача %s упала, попытка %s', name, attempts)
+    delay = settings.TASKS_RETRY_SECONDS * 2 ** (attempts - 1)
+    with serialized_writes():
+        Task.objects.filter(pk=task_id).update(
+            run_after=timezone.now() + timedelta(seconds=delay),
+            last_error=traceback.format_exc(),
+        )
+    return 'failed' if attempts >= settings.TASKS_MAX_ATTEMPTS else 'retry'
+
+
+def run_due_tasks(limit=None):
+    """Выполняет задачи, время которых пришло; возвращает их число.
+
+    Задачи, исчерпавшие TASKS_MAX_ATTEMPTS попыток, остаются в таблице
+    с последней ошибкой и не берутся.
+    """
+    due = Task.objects.filter(
+        run_after__lte=timezone.now(),
+        attempts__lt=settings.TASKS_MAX_ATTEMPTS,
+    ).values_list('pk', 'name', 'args', 'run_after', 'attempts')
+    done = 0
+    for task_id, name, args, run_after, attempts in due[
+        :limit or settings.TASKS_BATCH_SIZE
+    ]:
+        with serialized_writes():
+            claimed = _claim(task_id, run_after)
+        if not claimed:
+            continue
+        try:
+            _run(task_id, name, args)
+        except Exception:
+            outcome = _fail(task_id, name, attempts + 1)
+        else:
+            outcome = 'done'
+            done += 1
+        TASKS.inc(f'{name}:{outcome}')
+    return done
+
+
+class Worker:
+    """Поток процесса, выполняющий задачи из очереди.
+
+    Просыпается после фиксации новых задач и раз в TASKS_POLL_SECONDS —
+    за повторами и задачами, брошенными упавшими процессами.
+    """
+
+    def __init__(self):
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def start(self):
+        with self._lock:
+            if (
+                self._thread is not None and self._thread.is_alive()
+                and self._pid == os.getpid()
+            ):
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._loop, name='yatube-tasks', daemon=True
+            )
+            self._thread.start()
+
+    def wake(self):
+        self.start()
+        self._wakeup.set()
+
+    def _loop(self):
+        while True:
+            self._wakeup.wait(settings.TASKS_POLL_SECONDS)
+            self._wakeup.clear()
+            try:
+                while run_due_tasks():
+                    pass
+            except Exception:
+                logger.exception('Сбой исполнителя задач')
+            finally:
+                connections.close_all()
+
+
+worker = Worker()
+
+
+def start_worker():
+    """Запускает исполнитель процесса, если задачи не выполняются сразу."""
+    if not settings.TASKS_EAGER:
+        worker.wake()
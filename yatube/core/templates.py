@@ -0,0 +1,77 @@
+import os
+import time
+
+from django.conf import settings
+from django.template import (
+    TemplateDoesNotExist, TemplateSyntaxError, engines
+)
+from django.template.backends import django as backend
+
+from .metrics import current_recorder
+
+
+class Template(backend.Template):
+    def render(self, context=None, request=None):
+        recorder = current_recorder()
+        if recorder is None:
+            return super().render(context, request)
+        recorder.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            recorder.template_depth -= 1
+            if not recorder.template_depth:
+                recorder.template_seconds += time.perf_counter() - started
+
+
+class DjangoTemplates(backend.DjangoTemplates):
+    """Шаблонизатор Django, замеряющий время рендеринга для метрик."""
+
+    def from_string(self, template_code):
+        return Template(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return Template(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            backend.reraise(exc, self)
+
+
+def _template_dirs(loaders):
+    for loader in loaders:
+        yield from _template_dirs(getattr(loader, 'loaders', ()))
+        if hasattr(loader, 'get_dirs'):
+            yield from loader.get_dirs()
+
+
+def template_names(engine):
+    """Имена всех шаблонов, которые видят загрузчики шаблонизатора."""
+    names = set()
+    for directory in _template_dirs(engine.engine.template_loaders):
+        for root, _, files in os.walk(directory):
+            names.update(
+                os.path.relpath(os.path.join(root, name), directory)
+                for name in files if name.endswith(('.html', '.txt'))
+            )
+    return sorted(names)
+
+
+def warm_templates(force=False):
+    """Компилирует все шаблоны, чтобы их запомнил кэширующий загрузчик.
+
+    Без WARM_TEMPLATES (и без force) ничего не делает. Возвращает число
+    скомпилированных шаблонов и словарь ошибок по именам.
+    """
+    if not (force or settings.WARM_TEMPLATES):
+        return 0, {}
+    compiled, errors = 0, {}
+    for engine in engines.all():
+        for name in template_names(engine):
+            try:
+                engine.get_template(name)
+            except (TemplateDoesNotExist, TemplateSyntaxError) as error:
+                errors[name] = error
+            else:
+                compiled += 1
+    return compiled, errors
@@ -0,0 +1,110 @@
+import asyncio
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from ..asgi import AsgiHandler
+
+URL_OF_ABOUT = reverse('about:author')
+
+
+def scope(path, method='GET', query_string=b'', headers=()):
+    return {
+        'type': 'http',
+        'method': method,
+        'path': path,
+        'query_string': query_string,
+        'headers': [(b'host', b'testserver'), *headers],
+        'server': ('testserver', 80),
+        'client': ('127.0.0.1', 5000),
+    }
+
+
+class AsgiHandlerTest(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.handler = AsgiHandler()
+
+    def call(self, scope, body=b'', messages=None):
+        messages = messages or [
+            {'type': 'http.request', 'body': body[:3], 'more_body': True},
+            {'type': 'http.request', 'body': body[3:]},
+        ]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message)
+
+        asyncio.run(self.handler(scope, receive, send))
+        return sent
+
+    def test_response(self):
+        start, body = self.call(scope(URL_OF_ABOUT))
+        self.assertEqual(start['type'], 'http.response.start')
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'content-type', b'text/html; charset=utf-8'), start['headers']
+        )
+        self.assertIn('Об авторе'.encode(), body['body'])
+
+    def test_not_found(self):
+        start, body = self.call(scope('/unexisting_page/'))
+        self.assertEqual(start['status'], 404)
+
+    def test_truncated_body_is_not_processed(self):
+        """Отключение посреди тела: представление не вызывается."""
+        body = b'text=' + b'x' * 395
+        with patch.object(self.handler, 'run_wsgi') as run_wsgi:
+            sent = self.call(
+                scope(reverse('posts:post_create'), 'POST', headers=[
+                    (b'content-type', b'application/x-www-form-urlencoded'),
+                    (b'content-length', str(len(body)).encode()),
+                ]),
+                messages=[
+                    {'type': 'http.request', 'body': body[:150],
+                     'more_body': True},
+                    {'type': 'http.disconnect'},
+                ]
+            )
+        run_wsgi.assert_not_called()
+        self.assertEqual(sent, [])
+
+    def test_environ(self):
+        environ = self.handler.environ(scope(
+            '/группа/', 'POST', b'page=2', [
+                (b'content-type', b'text/plain'),
+                (b'x-forwarded-for', b'1.1.1.1'),
+                (b'x-forwarded-for', b'2.2.2.2'),
+            ]
+        ), BytesIO(b'data'))
+        self.assertEqual(
+            environ['PATH_INFO'].encode('latin1').decode(), '/группа/'
+        )
+        self.assertEqual(environ['QUERY_STRING'], 'page=2')
+        self.assertEqual(environ['CONTENT_TYPE'], 'text/plain')
+        self.assertEqual(environ['HTTP_X_FORWARDED_FOR'], '1.1.1.1,2.2.2.2')
+        self.assertEqual(environ['wsgi.input'].read(), b'data')
+
+    def test_read_only_views_use_read_pool(self):
+        cases = [
+            [scope(reverse('posts:index')), self.handler.read_pool],
+            [
+                scope(reverse('posts:post_detail', args=[1])),
+                self.handler.read_pool
+            ],
+            [
+                scope(reverse('posts:index'), method='POST'),
+                self.handler.write_pool
+            ],
+            [scope(reverse('posts:post_create')), self.handler.write_pool],
+            [scope('/unexisting_page/'), self.handler.write_pool],
+        ]
+        for request, pool in cases:
+            with self.subTest(path=request['path'], method=request['method']):
+                self.assertIs(self.handler.pool(request), pool)
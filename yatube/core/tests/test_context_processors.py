@@ -0,0 +1,24 @@
+import datetime
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase
+
+from ..context_processors.base import memoized_until
+from ..context_processors.year import year
+
+
+class MemoizedProcessorTest(SimpleTestCase):
+    @patch('core.context_processors.base.time')
+    def test_value_is_recomputed_after_tick(self, clock):
+        compute = Mock(__name__='compute', side_effect=[{'a': 1}, {'a': 2}])
+        processor = memoized_until(lambda now: now + 10)(compute)
+        clock.time.return_value = 100
+        self.assertEqual(processor(None), {'a': 1})
+        clock.time.return_value = 109
+        self.assertEqual(processor(None), {'a': 1})
+        clock.time.return_value = 110
+        self.assertEqual(processor(None), {'a': 2})
+        self.assertEqual(compute.call_count, 2)
+
+    def test_year(self):
+        self.assertEqual(year(None), {'year': datetime.date.today().year})
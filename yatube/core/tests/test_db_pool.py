@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase
+
+from core.db.backends.sqlite3.base import DatabaseWrapper
+from core.db.pool import POOL_EVENTS, get_pool, pool_key, pools
+from core.metrics import render_metrics
+
+
+class PooledBackendTest(SimpleTestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.settings_dict = {
+            **connection.settings_dict,
+            'NAME': os.path.join(directory, 'db.sqlite3'),
+            'POOL': {'MAX_SIZE': 1, 'TIMEOUT': 0.01},
+        }
+        self.pool = get_pool('pooled', self.settings_dict)
+        self.addCleanup(self.pool.clear)
+
+    def wrapper(self):
+        wrapper = DatabaseWrapper(self.settings_dict, alias='pooled')
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def test_closed_connection_returns_to_pool(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        self.assertEqual((self.pool.in_use, len(self.pool.idle)), (0, 1))
+        other = self.wrapper()
+        other.ensure_connection()
+        self.assertIs(other.connection, raw)
+        self.assertTrue(other.reused_connection)
+
+    def test_pool_is_bounded(self):
+        self.wrapper().ensure_connection()
+        timeouts = POOL_EVENTS.value('pooled:timeout')
+        with self.assertRaises(OperationalError):
+            self.wrapper().ensure_connection()
+        self.assertEqual(POOL_EVENTS.value('pooled:timeout'), timeouts + 1)
+
+    def test_broken_connection_is_replaced_on_checkout(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        wrapper.close()
+        raw.close()
+        discards = POOL_EVENTS.value('pooled:discard')
+        other = self.wrapper()
+        with other.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        self.assertIsNot(other.connection, raw)
+        self.assertFalse(other.reused_connection)
+        self.assertEqual(POOL_EVENTS.value('pooled:discard'), discards + 1)
+
+    def test_pool_saturation_is_exported(self):
+        self.wrapper().ensure_connection()
+        metrics = render_metrics()
+        self.assertIn('yatube_db_pool_connections{pool="pooled:in_use"} 1',
+                      metrics)
+        self.assertIn('yatube_db_pool_connections{pool="pooled:max"} 1',
+                      metrics)
+
+    def test_connection_inherited_through_fork_is_dropped(self):
+        wrapper = self.wrapper()
+        wrapper.ensure_connection()
+        raw = wrapper.connection
+        key = pool_key('pooled', self.settings_dict)
+        with patch('os.getpid', return_value=os.getpid() + 1):
+            child_pool = get_pool('pooled', self.settings_dict)
+            self.addCleanup(pools.__setitem__, key, self.pool)
+            wrapper.close()
+            self.assertEqual((child_pool.in_use, len(child_pool.idle)), (0, 0))
+        self.assertEqual((self.pool.in_use, len(self.pool.idle)), (1, 0))
+        # Соединение родителя не закрыто и не откачено.
+        raw.execute('SELECT 1')
+        raw.close()
@@ -0,0 +1,28 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from ..lru import LRUCache
+
+
+class LRUCacheTest(SimpleTestCase):
+    def test_least_recently_used_is_evicted(self):
+        cache = LRUCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(
+            [cache.get(key) for key in 'abc'], [1, None, 3]
+        )
+
+    @patch('core.lru.time')
+    def test_entries_expire_after_ttl(self, clock):
+        clock.monotonic.return_value = 100
+        cache = LRUCache(2, ttl=10)
+        cache.set('a', 1)
+        clock.monotonic.return_value = 109
+        self.assertEqual(cache.get('a'), 1)
+        clock.monotonic.return_value = 110
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(len(cache), 0)
@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import User
+
+from ..metrics import (
+    DB_QUERIES, REQUEST_SECONDS, TEMPLATE_SECONDS, Histogram
+)
+
+URL_OF_INDEX = reverse('posts:index')
+URL_OF_METRICS = reverse('metrics')
+
+
+def count(histogram, view):
+    return histogram._series[view][0]
+
+
+class RequestMetricsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.staff = User.objects.create_user(username='staff', is_staff=True)
+        cls.user = User.objects.create_user(username='user')
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(METRICS_SAMPLE_RATE=1)
+    def test_sampled_request_is_recorded(self):
+        before = sum(count(REQUEST_SECONDS, 'posts:index'))
+        queries = DB_QUERIES._series['posts:index'][1]
+        self.client.get(URL_OF_INDEX)
+        self.assertEqual(
+            sum(count(REQUEST_SECONDS, 'posts:index')), before + 1
+        )
+        self.assertGreater(DB_QUERIES._series['posts:index'][1], queries)
+        self.assertGreater(TEMPLATE_SECONDS._series['posts:index'][1], 0)
+        self.client.force_login(self.staff)
+        response = self.client.get(URL_OF_METRICS)
+        self.assertContains(
+            response, 'yatube_request_seconds_count{view="posts:index"}'
+        )
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_not_sampled_request_is_skipped(self):
+        before = sum(count(REQUEST_SECONDS, 'posts:index'))
+        self.client.get(URL_OF_INDEX)
+        self.assertEqual(sum(count(REQUEST_SECONDS, 'posts:index')), before)
+
+    def test_metrics_hidden_from_localhost_and_users(self):
+        """За прокси любой запрос приходит с 127.0.0.1."""
+        response = self.client.get(URL_OF_METRICS, REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 404)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(URL_OF_METRICS).status_code, 404)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_token(self):
+        for header, status in [
+            ('Bearer secret', 200),
+            ('Bearer wrong', 404),
+            ('', 404),
+        ]:
+            with self.subTest(header=header):
+                response = self.client.get(
+                    URL_OF_METRICS, HTTP_AUTHORIZATION=header
+                )
+                self.assertEqual(response.status_code, status)
+
+    def test_histogram_text_format(self):
+        histogram = Histogram('test_seconds', 'Тест.', 'view', (0.1, 1))
+        histogram.observe('a', 0.05)
+        histogram.observe('a', 0.5)
+        histogram.observe('a', 5)
+        self.assertEqual(histogram.render(), [
+            '# HELP test_seconds Тест.',
+            '# TYPE test_seconds histogram',
+            'test_seconds_bucket{view="a",le="0.1"} 1',
+            'test_seconds_bucket{view="a",le="1"} 2',
+            'test_seconds_bucket{view="a",le="+Inf"} 3',
+            'test_seconds_sum{view="a"} 5.55',
+            'test_seconds_count{view="a"} 3',
+        ])
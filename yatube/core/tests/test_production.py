@@ -0,0 +1,102 @@
+import importlib
+import os
+import sys
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.template import engines
+from django.test import SimpleTestCase, override_settings
+
+from ..templates import warm_templates
+
+PRODUCTION = 'yatube.settings_production'
+WORKER = 'yatube.settings_worker'
+ENVIRONMENT = {
+    'DJANGO_SECRET_KEY': 'secret',
+    'DJANGO_ALLOWED_HOSTS': 'yatube.example, www.yatube.example',
+    'DJANGO_DB_ENGINE': 'django.db.backends.postgresql',
+    'DJANGO_DB_NAME': 'yatube',
+}
+
+
+def production_settings(environment, module=PRODUCTION):
+    modules = (PRODUCTION, WORKER)
+    for name in modules:
+        sys.modules.pop(name, None)
+    with patch.dict(os.environ, environment, clear=True):
+        try:
+            return importlib.import_module(module)
+        finally:
+            for name in modules:
+                sys.modules.pop(name, None)
+
+
+class ProductionSettingsTest(SimpleTestCase):
+    def test_secret_key_is_required(self):
+        with self.assertRaises(ImproperlyConfigured):
+            production_settings({})
+
+    def test_settings_come_from_environment(self):
+        settings = production_settings(ENVIRONMENT)
+        self.assertFalse(settings.DEBUG)
+        self.assertEqual(settings.SECRET_KEY, 'secret')
+        self.assertEqual(
+            settings.ALLOWED_HOSTS, ['yatube.example', 'www.yatube.example']
+        )
+        self.assertEqual(
+            settings.DATABASES['default']['ENGINE'],
+            'django.db.backends.postgresql'
+        )
+        self.assertTrue(settings.WARM_TEMPLATES)
+
+    def test_cache_is_shared_between_processes(self):
+        settings = production_settings(ENVIRONMENT)
+        self.assertEqual(
+            settings.CACHES['default']['BACKEND'],
+            'django.core.cache.backends.filebased.FileBasedCache'
+        )
+        settings = production_settings({
+            **ENVIRONMENT,
+            'DJANGO_CACHE_BACKEND':
+                'django.core.cache.backends.memcached.MemcachedCache',
+            'DJANGO_CACHE_LOCATION': '127.0.0.1:11211',
+        })
+        self.assertEqual(
+            settings.CACHES['default']['LOCATION'], '127.0.0.1:11211'
+        )
+        with self.assertRaises(ImproperlyConfigured):
+            production_settings({
+                **ENVIRONMENT,
+                'DJANGO_CACHE_BACKEND':
+                    'django.core.cache.backends.locmem.LocMemCache',
+            })
+
+    def test_worker_settings_exclude_admin(self):
+        settings = production_settings(ENVIRONMENT, WORKER)
+        self.assertNotIn('django.contrib.admin', settings.INSTALLED_APPS)
+        self.assertIn('django.contrib.auth', settings.INSTALLED_APPS)
+        urls = importlib.import_module(settings.ROOT_URLCONF)
+        self.assertFalse(any(
+            str(pattern.pattern) == 'admin/' for pattern in urls.urlpatterns
+        ))
+
+    def test_templates_are_warmed_into_cached_loader(self):
+        settings = production_settings(ENVIRONMENT)
+        with override_settings(
+            TEMPLATES=settings.TEMPLATES,
+            WARM_TEMPLATES=settings.WARM_TEMPLATES
+        ):
+            warm_templates()
+            loader, = engines.all()[0].engine.template_loaders
+            self.assertIn('posts/index.html', loader.get_template_cache)
+            self.assertIn('admin/base.html', loader.get_template_cache)
+
+    def test_warm_templates_command(self):
+        out = StringIO()
+        call_command('warm_templates', stdout=out)
+        self.assertIn('Скомпилировано шаблонов', out.getvalue())
+
+    def test_development_does_not_warm(self):
+        self.assertEqual(warm_templates(), (0, {}))
@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.test import TransactionTestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+REPLICA = 'replica'
+URL_OF_INDEX = reverse('posts:index')
+URL_TO_CREATE_POST = reverse('posts:post_create')
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA])
+class ReplicaRouterTest(TransactionTestCase):
+    """Основная база — тестовая база default, реплика — файл SQLite."""
+
+    databases = {'default', REPLICA}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.mkdtemp()
+        connections.databases[REPLICA] = {
+            **connections['default'].settings_dict,
+            'NAME': os.path.join(cls.directory, 'replica.sqlite3'),
+        }
+        super().setUpClass()
+        call_command('sync_sqlite_replicas', stdout=StringIO())
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections[REPLICA].close()
+        del connections.databases[REPLICA]
+        if hasattr(connections._connections, REPLICA):
+            delattr(connections._connections, REPLICA)
+        shutil.rmtree(cls.directory)
+
+    def setUp(self):
+        cache.clear()
+        author = User.objects.create_user(username='auth', password='password')
+        User.objects.using(REPLICA).bulk_create([author])
+        # Реплика отстаёт: у каждой базы свой пост.
+        for database in ('default', REPLICA):
+            Post.objects.using(database).bulk_create([
+                Post(author=author, text=f'Пост из {database}')
+            ])
+
+    def test_read_only_view_reads_replica(self):
+        self.client.login(username='auth', password='password')
+        response = self.client.get(URL_OF_INDEX)
+        self.assertContains(response, 'Пост из replica')
+        self.assertNotContains(response, 'Пост из default')
+
+    def test_cached_feed_page_is_built_from_primary(self):
+        """Анонимная страница попадает в кэш только по основной базе."""
+        self.assertContains(self.client.get(URL_OF_INDEX), 'Пост из default')
+        # update минует сигналы: второй ответ отдаётся из кэша.
+        Post.objects.update(text='Изменённый пост')
+        self.assertContains(self.client.get(URL_OF_INDEX), 'Пост из default')
+
+    def test_other_views_read_primary(self):
+        self.client.login(username='auth', password='password')
+        response = self.client.get(reverse('posts:search'), {'q': 'Пост'})
+        self.assertContains(response, 'Пост из default')
+
+    def test_session_reads_primary_after_write(self):
+        self.client.login(username='auth', password='password')
+        self.assertContains(self.client.get(URL_OF_INDEX), 'Пост из replica')
+        self.client.post(URL_TO_CREATE_POST, {'text': 'Новый пост'})
+        self.assertEqual(Post.objects.using(REPLICA).count(), 1)
+        response = self.client.get(URL_OF_INDEX)
+        self.assertContains(response, 'Новый пост')
+        other = self.client_class()
+        other.login(username='auth', password='password')
+        self.assertNotContains(other.get(URL_OF_INDEX), 'Новый пост')
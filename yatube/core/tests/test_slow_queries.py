@@ -0,0 +1,82 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..slow_queries import fingerprint
+
+URL_OF_INDEX = reverse('posts:index')
+URL_OF_PROFILE = reverse('posts:profile', args=['author'])
+
+
+class SlowQueryLogTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        Post.objects.create(author=cls.user, text='Текст')
+
+    def logged(self, url):
+        cache.clear()
+        with self.assertLogs('yatube.slow_queries') as logs:
+            self.client.get(url)
+        return [json.loads(record.getMessage()) for record in logs.records]
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_query_logged_with_origin_and_plan(self):
+        """В журнал попадают представление, строка шаблона и EXPLAIN."""
+        records = self.logged(URL_OF_PROFILE)
+        self.assertTrue(all(
+            record['view'] == 'posts:profile' for record in records
+        ))
+        page = [
+            record for record in records
+            if record['template'] == 'posts/profile.html:11'
+        ]
+        self.assertEqual(len(page), 1)
+        self.assertIn('post_author_pub_date_idx', page[0]['explain'])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=0)
+    def test_index_page_reads_timeline_index(self):
+        timeline = [
+            record for record in self.logged(URL_OF_INDEX)
+            if 'posts_timelineentry' in record['sql']
+        ]
+        self.assertEqual(len(timeline), 1)
+        self.assertIn('timeline_pub_date_idx', timeline[0]['explain'])
+
+    @override_settings(SLOW_QUERY_THRESHOLD_MS=60_000)
+    def test_fast_queries_are_not_logged(self):
+        with self.assertRaises(AssertionError):
+            self.logged(URL_OF_INDEX)
+
+    def test_fingerprint_ignores_literals(self):
+        self.assertEqual(
+            fingerprint('SELECT * FROM t WHERE id IN (%s, %s) AND x = 1'),
+            fingerprint('SELECT *  FROM t WHERE id IN (%s, %s, %s) AND x = 2')
+        )
+
+    def test_report_groups_by_fingerprint(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        log = os.path.join(directory, 'slow.log')
+        with override_settings(SLOW_QUERY_THRESHOLD_MS=0):
+            records = self.logged(URL_OF_INDEX) + self.logged(URL_OF_INDEX)
+        with open(log, 'w') as file:
+            file.writelines(json.dumps(record) + '\n' for record in records)
+        output = StringIO()
+        call_command('slow_queries_report', '--log', log, '--json',
+                     stdout=output)
+        report = json.loads(output.getvalue())
+        self.assertEqual(
+            sum(group['count'] for group in report), len(records)
+        )
+        self.assertTrue(all(group['count'] == 2 for group in report))
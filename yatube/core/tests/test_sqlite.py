@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+
+from django.conf import settings
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from posts.models import Post, User
+
+from ..sqlite import write_lock
+
+
+class SQLitePragmasTest(SimpleTestCase):
+    def test_new_connection_gets_pragmas(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict,
+             'NAME': os.path.join(directory, 'db.sqlite3')},
+            alias='pragmas'
+        )
+        with override_settings(SQLITE_PRAGMAS=settings.SQLITE_WAL_PRAGMAS):
+            wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            for name, value in [
+                ('journal_mode', 'wal'),
+                ('synchronous', 1),
+                ('busy_timeout', 5000),
+                ('cache_size', -64 * 1024),
+            ]:
+                with self.subTest(pragma=name):
+                    cursor.execute(f'PRAGMA {name}')
+                    self.assertEqual(cursor.fetchone()[0], value)
+
+
+@override_settings(TASKS_EAGER=False)
+class SerializedWritesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def lock_held(self, submit):
+        """Держалась ли очередь писателей при каждом запросе к постам."""
+        held = {}
+
+        def record(execute, sql, params, many, context):
+            if '"posts_post"' in sql:
+                held[sql.split()[0]] = write_lock.locked()
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            submit()
+        self.assertFalse(write_lock.locked())
+        return held
+
+    def test_only_post_writes_take_write_lock(self):
+        held = self.lock_held(lambda: self.client.post(
+            reverse('posts:post_create'), {'text': 'Новый пост'}
+        ))
+        self.assertEqual(held, {'INSERT': True})
+        url = reverse('posts:post_edit', args=[Post.objects.get().pk])
+        state = self.client.get(url).context['edit_state']
+        held = self.lock_held(lambda: self.client.post(url, {
+            'text': 'Правка', 'edit_state': state
+        }))
+        self.assertEqual(held, {'UPDATE': True})
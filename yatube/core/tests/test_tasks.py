@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from ..models import Task
+from ..tasks import TASKS, run_due_tasks, task
+
+calls = []
+
+
+@task
+def remember(value):
+    calls.append(value)
+
+
+@task
+def explode():
+    raise ValueError('сбой')
+
+
+@override_settings(TASKS_EAGER=False, TASKS_MAX_ATTEMPTS=2)
+class TaskQueueTest(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_task_runs_once_and_leaves_queue(self):
+        remember.delay('значение')
+        self.assertEqual(calls, [])
+        self.assertEqual(run_due_tasks(), 1)
+        self.assertEqual(calls, ['значение'])
+        self.assertFalse(Task.objects.exists())
+        self.assertEqual(run_due_tasks(), 0)
+
+    @override_settings(TASKS_EAGER=True)
+    def test_eager_task_runs_immediately(self):
+        remember.delay('сразу')
+        self.assertEqual(calls, ['сразу'])
+        self.assertFalse(Task.objects.exists())
+
+    def test_failed_task_is_retried_later_then_given_up(self):
+        explode.delay()
+        retries = TASKS.value(f'{explode.task_name}:retry')
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            self.assertEqual(run_due_tasks(), 0)
+        queued = Task.objects.get()
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn('ValueError', queued.last_error)
+        self.assertGreater(queued.run_after, timezone.now())
+        self.assertEqual(
+            TASKS.value(f'{explode.task_name}:retry'), retries + 1
+        )
+        Task.objects.update(run_after=timezone.now())
+        with self.assertLogs('yatube.tasks', 'ERROR'):
+            run_due_tasks()
+        Task.objects.update(run_after=timezone.now())
+        run_due_tasks()
+        self.assertEqual(Task.objects.get().attempts, 2)
+
+    def test_abandoned_task_runs_after_lease(self):
+        """Задачу упавшего исполнителя берёт другой: хотя бы один раз."""
+        remember.delay('после аренды')
+        Task.objects.update(
+            run_after=timezone.now() + timedelta(minutes=1), attempts=1
+        )
+        self.assertEqual(run_due_tasks(), 0)
+        Task.objects.update(run_after=timezone.now())
+        self.assertEqual(run_due_tasks(), 1)
+        self.assertEqual(calls, ['после аренды'])
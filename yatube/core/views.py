@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from .metrics import render_metrics
+
+
+def _allowed(request):
+    # Адрес клиента не годится: за прокси на том же хосте он всегда
+    # 127.0.0.1.
+    if request.user.is_staff:
+        return True
+    token = settings.METRICS_TOKEN
+    return bool(token) and constant_time_compare(
+        request.META.get('HTTP_AUTHORIZATION', ''), f'Bearer {token}'
+    )
+
+
+def metrics(request):
+    """Метрики в текстовом формате Prometheus.
+
+    Доступны сотрудникам и по заголовку Authorization: Bearer METRICS_TOKEN.
+    """
+    if not _allowed(request):
+        raise Http404
+    return HttpResponse(
+        render_metrics(), content_type='text/plain; version=0.0.4'
+    )
@@ -0,0 +1,151 @@
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.servers.basehttp import (
+    ThreadedWSGIServer, WSGIRequestHandler
+)
+from django.core.wsgi import get_wsgi_application
+from django.db import connection
+from django.utils import timezone
+
+from .bulk import explicit_pub_date
+from .models import Group, Post, User
+
+BATCH_SIZE = 5000
+
+
+@contextmanager
+def benchmark_database():
+    """Тестовая копия базы из DATABASES на время замеров.
+
+    SQLite-копия создаётся файлом, чтобы у каждого потока сервера было
+    своё соединение, как в настоящем развёртывании.
+    """
+    old_name = connection.settings_dict['NAME']
+    test_settings = connection.settings_dict.setdefault('TEST', {})
+    directory = None
+    if connection.vendor == 'sqlite':
+        directory = tempfile.mkdtemp()
+        test_settings['NAME'] = os.path.join(directory, 'bench.sqlite3')
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        if directory is not None:
+            test_settings.pop('NAME')
+            shutil.rmtree(directory)
+
+
+def seed(authors, groups, prefix='bench'):
+    """Создаёт авторов и группы для нагрузочного набора данных."""
+    User.objects.bulk_create(
+        User(username=f'{prefix}{number}') for number in range(authors)
+    )
+    Group.objects.bulk_create(
+        Group(title=f'Группа {number}', slug=f'{prefix}-{number}')
+        for number in range(groups)
+    )
+    return (
+        list(User.objects.filter(
+            username__startswith=prefix
+        ).values_list('pk', flat=True)),
+        list(Group.objects.filter(
+            slug__startswith=prefix
+        ).values_list('pk', flat=True)),
+    )
+
+
+def seed_posts(total, author_ids, group_ids, start=0, batch_size=BATCH_SIZE):
+    """Добавляет посты пачками; pub_date идут с шагом в минуту в прошлое.
+
+    Счётчики и прочие сигналы при этом не срабатывают.
+    """
+    now = timezone.now()
+    with explicit_pub_date():
+        for offset in range(start, start + total, batch_size):
+            Post.objects.bulk_create(
+                Post(
+                    text=f'Пост номер {number}',
+                    pub_date=now - timedelta(minutes=number),
+                    author_id=random.choice(author_ids),
+                    group_id=random.choice(group_ids + [None]),
+                )
+                for number in range(
+                    offset, min(offset + batch_size, start + total)
+                )
+            )
+
+
+def measure(func, repeat):
+    """Вызывает func repeat раз, возвращает задержки в миллисекундах."""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def percentiles(timings):
+    if not timings:
+        return {'p50': None, 'p95': None, 'p99': None}
+    points = statistics.quantiles(
+        timings * 2 if len(timings) == 1 else timings,
+        n=100, method='inclusive'
+    )
+    return {
+        'p50': round(points[49], 3),
+        'p95': round(points[94], 3),
+        'p99': round(points[98], 3),
+    }
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def local_server():
+    """Поднимает многопоточный WSGI-сервер проекта на свободном порту."""
+    server = ThreadedWSGIServer(('127.0.0.1', 0), QuietHandler)
+    server.daemon_threads = True
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f'http://127.0.0.1:{server.server_port}'
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def run_load(call, requests, concurrency):
+    """Выполняет call(number) requests раз в concurrency потоков.
+
+    Возвращает задержки удачных вызовов в миллисекундах, число ошибок и
+    общее время в секундах.
+    """
+    def timed(number):
+        started = time.perf_counter()
+        try:
+            call(number)
+        except Exception:
+            return None
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        results = list(executor.map(timed, range(requests)))
+    elapsed = time.perf_counter() - started
+    timings = [result for result in results if result is not None]
+    return timings, len(results) - len(timings), elapsed
@@ -0,0 +1,19 @@
+from contextlib import contextmanager
+
+from .models import Post
+
+
+@contextmanager
+def explicit_pub_date():
+    """Даёт bulk_create сохранить заданный pub_date вместо текущего времени.
+
+    Поле объявлено с auto_now_add, и его pre_save подменяет значение при
+    вставке. Флаг меняется на время блока, поэтому вызывать только из
+    однопоточных команд управления.
+    """
+    field = Post._meta.get_field('pub_date')
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
@@ -0,0 +1,99 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+
+from core.routers import read_from_primary
+
+from .settings import FEED_CACHE_TIMEOUT
+
+INDEX = 'index'
+GROUPS = 'groups'
+
+
+def author_scope(username):
+    return f'author:{username}'
+
+
+def group_scope(slug):
+    return f'group:{slug}'
+
+
+def _generation_key(scope):
+    return f'feed-generation:{scope}'
+
+
+def feed_generations(scopes):
+    """Текущие поколения лент одним обращением к кэшу."""
+    keys = {_generation_key(scope): scope for scope in scopes}
+    found = cache.get_many(keys)
+    for key in keys.keys() - found.keys():
+        # Начинаем с текущего времени, а не с единицы: после вытеснения
+        # ключа поколение не совпадёт ни с одним из прежних.
+        cache.add(key, int(time.time() * 1000), None)
+        found[key] = cache.get(key)
+    return [found[_generation_key(scope)] for scope in scopes]
+
+
+def bump_feeds(*scopes):
+    """Сбрасывает кэш перечисленных лент, сдвигая их поколения."""
+    for scope in scopes:
+        try:
+            cache.incr(_generation_key(scope))
+        except ValueError:
+            feed_generations([scope])
+
+
+def bump_feeds_on_commit(*scopes):
+    """Сдвигает поколения сразу и ещё раз после фиксации транзакции.
+
+    Второй сдвиг отбрасывает страницы, которые параллельный запрос успел
+    закэшировать по данным, ещё не видевшим изменения.
+    """
+    bump_feeds(*scopes)
+    transaction.on_commit(lambda: bump_feeds(*scopes))
+
+
+def feed_version(feeds, kwargs):
+    """Версия страницы: поколения лент, заданных для представления."""
+    scopes = [feed(**kwargs) if callable(feed) else feed for feed in feeds]
+    return '.'.join(map(str, feed_generations(scopes)))
+
+
+def cache_feed(*feeds):
+    """Кэширует страницу ленты для анонимных пользователей.
+
+    Ленты, от которых зависит страница, задаются строкой или функцией от
+    аргументов представления; ключ кэша включает поколения этих лент.
+    Вместе с телом хранятся заголовки ответа; ответы с cookie не кэшируются.
+    Промах строится по основной базе: страница с отстающей реплики
+    осталась бы в кэше под уже сдвинутым поколением.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method != 'GET' or request.user.is_authenticated:
+                return view(request, *args, **kwargs)
+            generations = feed_version(feeds, kwargs)
+            path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = f'feed-page:{generations}:{path}'
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                response = HttpResponse(content)
+                for header, value in headers:
+                    response[header] = value
+                return response
+            read_from_primary(request)
+            response = view(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                cache.set(
+                    key, (response.content, list(response.items())),
+                    FEED_CACHE_TIMEOUT
+                )
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,49 @@
+import hashlib
+
+from django.views.decorators.http import condition
+
+from .cache import GROUPS, feed_version
+from .models import Post
+
+
+def _etag(*parts):
+    return hashlib.md5(':'.join(map(str, parts)).encode()).hexdigest()
+
+
+def feed_condition(*feeds):
+    """ETag для страницы ленты.
+
+    ETag собирается из поколений лент без обращения к базе и меняется при
+    любой правке. Last-Modified не отдаётся: дата самого нового поста не
+    меняется при правке, удалении или переименовании, а If-Modified-Since
+    без If-None-Match Django проверяет по ней одной.
+    """
+    def etag(request, **kwargs):
+        return _etag(
+            feed_version(feeds, kwargs),
+            request.get_full_path(),
+            request.user.pk,
+        )
+
+    return condition(etag_func=etag)
+
+
+def post_etag(request, post_id):
+    state = Post.objects.filter(pk=post_id).values_list(
+        'updated',
+        'author__username',
+        'author__first_name',
+        'author__last_name',
+        'author__post_counter__post_count',
+    ).first()
+    if state is not None:
+        return _etag(
+            *state,
+            feed_version([GROUPS], {}),
+            request.user.pk
+        )
+
+
+# Last-Modified по полю updated не видит правок автора и счётчиков,
+# которые входят в ETag, поэтому страница поста отдаёт только ETag.
+post_condition = condition(etag_func=post_etag)
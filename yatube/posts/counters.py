@@ -0,0 +1,62 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from .models import AuthorPostCounter, GroupPostCounter, Post
+
+
+def _change(model, owner, owner_id, delta):
+    """Сдвигает счётчик на delta; строка создаётся с первым постом."""
+    if owner_id is None or not delta:
+        return
+    counters = model.objects.filter(**{owner: owner_id})
+    if delta < 0:
+        # Счётчик, уже ушедший в расхождение, не уводим ниже нуля.
+        counters = counters.filter(post_count__gte=-delta)
+    if counters.update(post_count=F('post_count') + delta) or delta < 0:
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(**{owner: owner_id, 'post_count': delta})
+    except IntegrityError:
+        # Строку счётчика успел создать параллельный писатель.
+        _change(model, owner, owner_id, delta)
+
+
+def change_author_count(author_id, delta):
+    _change(AuthorPostCounter, 'author_id', author_id, delta)
+
+
+def change_group_count(group_id, delta):
+    _change(GroupPostCounter, 'group_id', group_id, delta)
+
+
+def _read(model, owner, owner_id):
+    return model.objects.filter(**{owner: owner_id}).values_list(
+        'post_count', flat=True
+    ).first() or 0
+
+
+def author_post_count(author_id):
+    return _read(AuthorPostCounter, 'author_id', author_id)
+
+
+def group_post_count(group_id):
+    return _read(GroupPostCounter, 'group_id', group_id)
+
+
+def _rebuild(model, owner):
+    totals = Post.objects.order_by().filter(
+        **{f'{owner}__isnull': False}
+    ).values_list(owner).annotate(Count('pk'))
+    model.objects.all().delete()
+    model.objects.bulk_create(
+        model(**{owner: owner_id, 'post_count': total})
+        for owner_id, total in totals
+    )
+
+
+@transaction.atomic
+def rebuild_counters():
+    """Пересчитывает все счётчики постов по таблице постов."""
+    _rebuild(AuthorPostCounter, 'author_id')
+    _rebuild(GroupPostCounter, 'group_id')
@@ -0,0 +1,71 @@
+import hashlib
+
+from django.core import signing
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from core.sqlite import serialized_writes
+
+from .models import Post
+from .tasks import record_post_write
+
+SALT = 'posts.editing'
+EDIT_CONFLICT = (
+    'Пост изменили, пока вы его редактировали. Отправьте форму ещё раз, '
+    'чтобы заменить новую версию своей.'
+)
+
+
+def _digest(text):
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+def post_state(post):
+    """Пост, версия, группа и хеш текста, с которыми открыта форма."""
+    return post.pk, post.version, post.group_id, _digest(post.text)
+
+
+def sign_state(post):
+    return signing.dumps(post_state(post), salt=SALT)
+
+
+def unsign_state(value):
+    """Состояние из формы или None, если его нет или оно подделано."""
+    try:
+        return tuple(signing.loads(value, salt=SALT))
+    except signing.BadSignature:
+        return None
+
+
+def save_post_edit(post_id, author_id, state, text, group):
+    """Записывает изменённые поля поста одним условным UPDATE.
+
+    Строка обновляется, только если пост принадлежит автору и не менялся
+    с состояния state. Возвращает False, если такой строки нет или state
+    снято с другого поста. Сигналы Post при этом не срабатывают, поэтому
+    счётчики и задача sync_post — здесь же, в транзакции UPDATE.
+    """
+    pk, version, old_group_id, digest = state
+    if pk != post_id:
+        return False
+    group_id = group.pk if group is not None else None
+    changes = {}
+    if _digest(text) != digest:
+        changes['text'] = text
+    if group_id != old_group_id:
+        changes['group_id'] = group_id
+    if not changes:
+        return True
+    posts = Post.objects.filter(
+        pk=post_id, version=version, author_id=author_id
+    )
+    with serialized_writes(), transaction.atomic():
+        if not posts.update(
+            version=F('version') + 1, updated=timezone.now(), **changes
+        ):
+            return False
+        record_post_write(
+            post_id, (author_id, old_group_id), (author_id, group_id)
+        )
+    return True
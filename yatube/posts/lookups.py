@@ -0,0 +1,69 @@
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.shortcuts import get_object_or_404
+
+from core.lru import LRUCache
+from core.metrics import Counter, Gauge, register
+
+from .models import Group, User
+from .settings import LOOKUP_CACHE_SIZE, LOOKUP_CACHE_TTL
+
+# Поля автора, которые выводят страницы; хэш пароля и права в кэш не
+# попадают. Порядок — как у полей модели, этого ждёт User.from_db.
+AUTHOR_FIELDS = ('id', 'username', 'first_name', 'last_name')
+
+groups = LRUCache(LOOKUP_CACHE_SIZE, LOOKUP_CACHE_TTL)
+authors = LRUCache(LOOKUP_CACHE_SIZE, LOOKUP_CACHE_TTL)
+
+LOOKUPS = register(Counter(
+    'yatube_lookup_cache_total',
+    'Обращения к кэшу групп и авторов по результату.', 'result'
+))
+register(Gauge(
+    'yatube_lookup_cache_entries', 'Записей в кэше групп и авторов.',
+    'cache', lambda: {'group': len(groups), 'author': len(authors)}
+))
+
+
+def _lookup(cache, name, queryset, key, **lookup):
+    found = cache.get(key)
+    if found is not None:
+        LOOKUPS.inc(f'{name}_hit')
+        return found
+    LOOKUPS.inc(f'{name}_miss')
+    found = get_object_or_404(queryset, **lookup)
+    # Запоминаем только зафиксированное: прочитанное в транзакции, которая
+    # потом откатилась (в том числе в TestCase), в кэш не попадёт.
+    transaction.on_commit(lambda: cache.set(key, found))
+    return found
+
+
+def get_group(slug):
+    """Группа по slug с запоминанием в памяти процесса.
+
+    Сигналы сбрасывают запись только в своём процессе, в остальных она
+    устаревает не позже чем через LOOKUP_CACHE_TTL.
+    """
+    return _lookup(groups, 'group', Group, slug, slug=slug)
+
+
+def get_author(username):
+    """Автор по username, запоминается так же, как группа.
+
+    В кэше лежат только AUTHOR_FIELDS, остальные поля возвращённого
+    автора отложены и при обращении читаются из базы.
+    """
+    values = _lookup(
+        authors, 'author', User.objects.values_list(*AUTHOR_FIELDS),
+        username, username=username
+    )
+    return User.from_db(DEFAULT_DB_ALIAS, AUTHOR_FIELDS, values)
+
+
+def forget_group(*slugs):
+    for slug in slugs:
+        groups.pop(slug)
+
+
+def forget_author(*usernames):
+    for username in usernames:
+        authors.pop(username)
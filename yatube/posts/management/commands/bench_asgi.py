@@ -0,0 +1,139 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+from django.urls import reverse
+
+from core.asgi import AsgiHandler
+from posts.bench import benchmark_database, percentiles, seed, seed_posts
+from posts.counters import rebuild_counters
+from posts.models import Group, Post, User
+from posts.timeline import rebuild_timeline
+
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Сравнивает ASGI-обработчик и WSGI-развёртывание на лентах и '
+        'страницах поста при медленной базе. WSGI моделируется '
+        '--wsgi-workers синхронными воркерами по одному запросу за раз, '
+        'ASGI — одним циклом событий с пулом ASGI_READ_THREADS потоков. '
+        'Кэш страниц на время замера отключён.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=10_000)
+        parser.add_argument('--authors', type=int, default=100)
+        parser.add_argument('--groups', type=int, default=10)
+        parser.add_argument('--requests', type=int, default=400)
+        parser.add_argument('--concurrency', type=int, default=64)
+        parser.add_argument('--wsgi-workers', type=int, default=8)
+        parser.add_argument(
+            '--db-delay-ms', type=float, default=20,
+            help='Задержка, добавляемая к каждому SQL-запросу.'
+        )
+
+    def handle(self, **options):
+        with benchmark_database(), override_settings(CACHES=NO_CACHE):
+            author_ids, group_ids = seed(options['authors'], options['groups'])
+            seed_posts(options['posts'], author_ids, group_ids)
+            rebuild_counters()
+            rebuild_timeline()
+            paths = self.paths()
+            delay = options['db_delay_ms'] / 1000
+
+            def slow_database(sender, connection, **kwargs):
+                connection.execute_wrappers.append(
+                    lambda execute, *args: time.sleep(delay) or execute(*args)
+                )
+
+            connection_created.connect(slow_database)
+            try:
+                handler = AsgiHandler()
+                report = {
+                    'db_delay_ms': options['db_delay_ms'],
+                    'requests': options['requests'],
+                    'concurrency': options['concurrency'],
+                    'wsgi': self.wsgi(handler, paths, **options),
+                    'asgi': asyncio.run(self.asgi(handler, paths, **options)),
+                }
+            finally:
+                connection_created.disconnect(slow_database)
+        self.stdout.write(json.dumps(report, indent=2))
+
+    def paths(self):
+        slugs = list(Group.objects.values_list('slug', flat=True))
+        usernames = list(User.objects.values_list('username', flat=True))
+        post_ids = list(Post.objects.values_list('pk', flat=True)[:1000])
+        return [
+            reverse('posts:index'),
+            *(reverse('posts:group_list', args=[slug]) for slug in slugs),
+            *(reverse('posts:profile', args=[name]) for name in usernames),
+            *(reverse('posts:post_detail', args=[pk]) for pk in post_ids),
+        ]
+
+    def scope(self, path):
+        return {
+            'type': 'http',
+            'method': 'GET',
+            'path': path,
+            'query_string': b'',
+            'headers': [(b'host', b'localhost')],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 0),
+        }
+
+    def wsgi(self, handler, paths, requests, concurrency, wsgi_workers,
+             **options):
+        workers = threading.BoundedSemaphore(wsgi_workers)
+
+        def client(number):
+            requested = time.perf_counter()
+            with workers:
+                handler.run_wsgi(handler.environ(
+                    self.scope(random.choice(paths)), BytesIO()
+                ))
+            return (time.perf_counter() - requested) * 1000
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as clients:
+            timings = list(clients.map(client, range(requests)))
+        return self.result(timings, time.perf_counter() - started)
+
+    async def asgi(self, handler, paths, requests, concurrency, **options):
+        timings = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def client():
+            async with semaphore:
+                sent = []
+
+                async def receive():
+                    return {'type': 'http.request', 'body': b''}
+
+                async def send(message):
+                    sent.append(message)
+
+                requested = time.perf_counter()
+                await handler(self.scope(random.choice(paths)), receive, send)
+                timings.append((time.perf_counter() - requested) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(requests)))
+        return self.result(timings, time.perf_counter() - started)
+
+    def result(self, timings, elapsed):
+        return dict(
+            percentiles(timings),
+            throughput=round(len(timings) / elapsed, 1),
+        )
@@ -0,0 +1,56 @@
+import json
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts.bench import (
+    benchmark_database, measure, percentiles, seed, seed_posts
+)
+from posts.models import Post
+from posts.settings import POSTS_PER_PAGE
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет выборку страницы лент index, profile и group_posts '
+        'при росте таблицы постов. Работает на тестовой копии базы '
+        'из DATABASES, поэтому годится и для SQLite, и для PostgreSQL.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes', type=int, nargs='+',
+            default=[10_000, 100_000, 1_000_000],
+            help='Размеры таблицы постов, по возрастанию.'
+        )
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=100)
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        with benchmark_database():
+            report = self.run(**options)
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def run(self, sizes, authors, groups, repeat, **options):
+        author_ids, group_ids = seed(authors, groups)
+        author_id, group_id = author_ids[0], group_ids[0]
+        feeds = {
+            'index': Post.objects.feed(),
+            'profile': Post.objects.feed().filter(author_id=author_id),
+            'group_posts': Post.objects.feed().filter(group_id=group_id),
+        }
+        report = {'vendor': connection.vendor, 'sizes': []}
+        seeded = 0
+        for size in sorted(sizes):
+            seed_posts(size - seeded, author_ids, group_ids, start=seeded)
+            seeded = size
+            result = {'posts': size}
+            for name, feed in feeds.items():
+                result[name] = percentiles(measure(
+                    lambda: list(feed[:POSTS_PER_PAGE]), repeat
+                ))
+                result[name]['plan'] = feed[:POSTS_PER_PAGE].explain()
+            report['sizes'].append(result)
+            self.stderr.write(f'{size} постов готово')
+        return report
@@ -0,0 +1,115 @@
+import json
+import random
+import threading
+import time
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections, transaction
+from django.test.utils import override_settings
+
+from core.sqlite import serialized_writes
+from posts.bench import benchmark_database, percentiles, seed, seed_posts
+from posts.counters import rebuild_counters
+from posts.models import Post
+from posts.settings import POSTS_PER_PAGE
+from posts.timeline import rebuild_timeline
+
+NO_CACHE = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Замеряет чтение ленты во время всплеска записей в SQLite: '
+        'журнал отката без очереди писателей против WAL с настройками '
+        'SQLITE_WAL_PRAGMAS и очередью core.sqlite.serialized_writes.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=20_000)
+        parser.add_argument('--readers', type=int, default=8)
+        parser.add_argument('--writers', type=int, default=4)
+        parser.add_argument('--seconds', type=float, default=5)
+
+    def handle(self, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Замер имеет смысл только для SQLite.')
+        with benchmark_database(), override_settings(CACHES=NO_CACHE):
+            author_ids, group_ids = seed(100, 10)
+            seed_posts(options['posts'], author_ids, group_ids)
+            rebuild_counters()
+            rebuild_timeline()
+            report = {
+                'rollback_journal': self.run(
+                    {'journal_mode': 'delete'}, False, author_ids, **options
+                ),
+                'wal_serialized': self.run(
+                    settings.SQLITE_WAL_PRAGMAS, True, author_ids, **options
+                ),
+            }
+        self.stdout.write(json.dumps(report, indent=2, ensure_ascii=False))
+
+    def run(self, pragmas, serialize, author_ids, readers, writers, seconds,
+            **options):
+        connections.close_all()
+        self.stop = threading.Event()
+        self.lock = threading.Lock()
+        self.reads, self.writes, self.errors = [], [], []
+        queue = serialized_writes if serialize else nullcontext
+        with override_settings(SQLITE_PRAGMAS=pragmas):
+            threads = [
+                threading.Thread(target=self.read) for _ in range(readers)
+            ] + [
+                threading.Thread(target=self.write, args=(queue, author_ids))
+                for _ in range(writers)
+            ]
+            for thread in threads:
+                thread.start()
+            time.sleep(seconds)
+            self.stop.set()
+            for thread in threads:
+                thread.join()
+            connections.close_all()
+        return {
+            'reads_per_second': round(len(self.reads) / seconds, 1),
+            'read_ms': percentiles(self.reads),
+            'writes_per_second': round(sum(self.writes) / seconds, 1),
+            'read_errors': self.errors.count('read'),
+            'write_errors': self.errors.count('write'),
+        }
+
+    def read(self):
+        timings = []
+        while not self.stop.is_set():
+            started = time.perf_counter()
+            try:
+                list(Post.objects.feed()[:POSTS_PER_PAGE])
+            except OperationalError:
+                with self.lock:
+                    self.errors.append('read')
+                continue
+            timings.append((time.perf_counter() - started) * 1000)
+        connection.close()
+        with self.lock:
+            self.reads.extend(timings)
+
+    def write(self, queue, author_ids):
+        done = 0
+        while not self.stop.is_set():
+            try:
+                with queue(), transaction.atomic():
+                    Post.objects.create(
+                        author_id=random.choice(author_ids),
+                        text='Пост из всплеска записей'
+                    )
+            except OperationalError:
+                with self.lock:
+                    self.errors.append('write')
+                continue
+            done += 1
+        connection.close()
+        with self.lock:
+            self.writes.append(done)
@@ -0,0 +1,206 @@
+import json
+import queue
+import random
+import re
+import subprocess
+import urllib.parse
+import urllib.request
+import uuid
+from http.cookies import SimpleCookie
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from posts.bench import (
+    benchmark_database, local_server, percentiles, run_load, seed, seed_posts
+)
+from posts.counters import rebuild_counters
+from posts.models import Group, Post, User
+from posts.timeline import rebuild_timeline
+
+CSRF_INPUT = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+
+
+class Session:
+    """HTTP-клиент одного пользователя поверх urllib с cookie и CSRF."""
+
+    def __init__(self, base_url, user=None):
+        self.base_url = base_url
+        self.cookies = SimpleCookie()
+        if user is not None:
+            client = Client()
+            client.force_login(user)
+            self.cookies.update(client.cookies)
+            self.token = CSRF_INPUT.search(
+                self.open(reverse('posts:post_create')).decode()
+            ).group(1)
+
+    def open(self, path, data=None):
+        request = urllib.request.Request(self.base_url + path, data, {
+            'Cookie': '; '.join(
+                f'{name}={morsel.value}'
+                for name, morsel in self.cookies.items()
+            )
+        })
+        with urllib.request.urlopen(request) as response:
+            self.cookies.load('\n'.join(
+                response.headers.get_all('Set-Cookie') or []
+            ))
+            return response.read()
+
+    def get(self, path):
+        return self.open(path)
+
+    def post(self, path, data):
+        return self.open(path, urllib.parse.urlencode(
+            dict(data, csrfmiddlewaretoken=self.token)
+        ).encode())
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный прогон основных страниц на тестовой копии базы: '
+        'заполняет её данными, поднимает локальный сервер и гоняет по нему '
+        'параллельных клиентов. Отчёт в JSON удобно сравнивать между '
+        'коммитами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--posts', type=int, default=100_000)
+        parser.add_argument('--authors', type=int, default=1000)
+        parser.add_argument('--groups', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=500)
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output', help='Файл для отчёта, по умолчанию stdout.'
+        )
+
+    def handle(self, **options):
+        random.seed(options['seed'])
+        with benchmark_database():
+            report = self.run(**options)
+        report = json.dumps(report, indent=2, ensure_ascii=False)
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                file.write(report + '\n')
+        else:
+            self.stdout.write(report)
+
+    def run(self, posts, authors, groups, requests, concurrency, **options):
+        author_ids, group_ids = seed(authors, groups)
+        seed_posts(posts, author_ids, group_ids)
+        rebuild_counters()
+        rebuild_timeline()
+        connection.close()
+        user = User.objects.get(pk=author_ids[0])
+        slugs = list(Group.objects.values_list('slug', flat=True))
+        usernames = list(User.objects.values_list('username', flat=True))
+        post_ids = list(Post.objects.values_list('pk', flat=True)[:10_000])
+        own_ids = list(user.posts.values_list('pk', flat=True)[:100])
+        group_id = str(group_ids[0])
+
+        scenarios = {
+            'index': lambda: reverse('posts:index') + '?page={}'.format(
+                random.randint(1, 20)
+            ),
+            'group_posts': lambda: reverse(
+                'posts:group_list', args=[random.choice(slugs)]
+            ),
+            'profile': lambda: reverse(
+                'posts:profile', args=[random.choice(usernames)]
+            ),
+            'post_detail': lambda: reverse(
+                'posts:post_detail', args=[random.choice(post_ids)]
+            ),
+        }
+        # Анонимные ленты почти всегда отдаются из cache_feed. Варианты
+        # _cold добавляют к адресу уникальный параметр: ключ кэша
+        # включает полный путь, и страница каждый раз строится заново.
+        for name in ('index', 'group_posts', 'profile'):
+            scenarios[f'{name}_cold'] = self.uncached(scenarios[name])
+        writes = {
+            'post_create': lambda: (
+                reverse('posts:post_create'),
+                {'text': 'Нагрузочный пост', 'group': group_id},
+            ),
+            'post_edit': lambda: (
+                reverse('posts:post_edit', args=[random.choice(own_ids)]),
+                {'text': 'Отредактированный пост', 'group': group_id},
+            ),
+        }
+        report = {
+            'commit': self.commit(),
+            'vendor': connection.vendor,
+            'dataset': {'posts': posts, 'authors': authors, 'groups': groups},
+            'requests': requests,
+            'concurrency': concurrency,
+            'note': (
+                'Анонимные ленты без _cold в основном попадают в cache_feed.'
+            ),
+            'views': {},
+        }
+        with local_server() as base_url:
+            # Вход — до замеров: запрос берёт готовую сессию и возвращает.
+            logged_in = queue.SimpleQueue()
+            for _ in range(concurrency):
+                logged_in.put(Session(base_url, user))
+
+            def authorized_post(path, data):
+                session = logged_in.get()
+                try:
+                    return session.post(path, data)
+                finally:
+                    logged_in.put(session)
+
+            for name, path in scenarios.items():
+                report['views'][name] = self.measure(
+                    lambda number: Session(base_url).get(path()),
+                    requests, concurrency, self.queries(user, 'get', path())
+                )
+            for name, request in writes.items():
+                report['views'][name] = self.measure(
+                    lambda number: authorized_post(*request()),
+                    requests, concurrency,
+                    self.queries(user, 'post', *request())
+                )
+        return report
+
+    @staticmethod
+    def uncached(path):
+        def cold_path():
+            url = path()
+            separator = '&' if '?' in url else '?'
+            return f'{url}{separator}cold={uuid.uuid4().hex}'
+        return cold_path
+
+    def measure(self, call, requests, concurrency, queries):
+        timings, errors, elapsed = run_load(call, requests, concurrency)
+        self.stderr.write(f'{len(timings)} запросов за {elapsed:.1f} с')
+        return dict(
+            percentiles(timings),
+            throughput=round(len(timings) / elapsed, 1),
+            errors=errors,
+            queries=queries,
+        )
+
+    def queries(self, user, method, *args):
+        """Число SQL-запросов одного запроса через тестовый клиент."""
+        client = Client()
+        if method == 'post':
+            client.force_login(user)
+        with CaptureQueriesContext(connection) as captured:
+            getattr(client, method)(*args)
+        return len(captured)
+
+    def commit(self):
+        try:
+            return subprocess.run(
+                ['git', 'rev-parse', 'HEAD'],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
@@ -0,0 +1,59 @@
+import csv
+import json
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from posts.models import Post
+
+FIELDS = ('id', 'text', 'pub_date', 'author', 'group')
+
+
+class Command(BaseCommand):
+    help = 'Потоково выгружает посты в NDJSON или CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output', nargs='?', default='-',
+            help='Файл для выгрузки, по умолчанию stdout.'
+        )
+        parser.add_argument(
+            '--format', choices=['ndjson', 'csv'], default='ndjson'
+        )
+        parser.add_argument(
+            '--after-id', type=int, default=0,
+            help='Выгружать посты с id больше заданного.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, output, format, after_id, chunk_size, **options):
+        rows = Post.objects.filter(pk__gt=after_id).order_by('pk').values_list(
+            'pk', 'text', 'pub_date', 'author__username', 'group__slug'
+        ).iterator(chunk_size=chunk_size)
+        if output == '-':
+            exported, elapsed = self.export(rows, sys.stdout, format)
+        else:
+            with open(output, 'w', encoding='utf-8', newline='') as file:
+                exported, elapsed = self.export(rows, file, format)
+        self.stderr.write(
+            f'Выгружено постов: {exported} '
+            f'({exported / max(elapsed, 1e-9):.0f} в секунду).'
+        )
+
+    def export(self, rows, file, format):
+        started = time.perf_counter()
+        exported = 0
+        if format == 'csv':
+            writer = csv.writer(file)
+            writer.writerow(FIELDS)
+            write = writer.writerow
+        else:
+            def write(row):
+                file.write(json.dumps(
+                    dict(zip(FIELDS, row)), ensure_ascii=False
+                ) + '\n')
+        for pk, text, pub_date, author, group in rows:
+            write([pk, text, pub_date.isoformat(), author, group or ''])
+            exported += 1
+        return exported, time.perf_counter() - started
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from posts.counters import rebuild_counters
+from posts.models import AuthorPostCounter, GroupPostCounter
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики постов авторов и групп.'
+
+    def handle(self, *args, **options):
+        rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(
+            f'Пересчитано: авторов {AuthorPostCounter.objects.count()}, '
+            f'групп {GroupPostCounter.objects.count()}.'
+        ))
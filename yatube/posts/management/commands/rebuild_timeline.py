@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from posts.cache import INDEX, bump_feeds
+from posts.models import TimelineEntry
+from posts.timeline import rebuild_timeline
+
+
+class Command(BaseCommand):
+    help = 'Заполняет заново таблицу свежих постов общей ленты.'
+
+    def handle(self, *args, **options):
+        rebuild_timeline()
+        bump_feeds(INDEX)
+        self.stdout.write(self.style.SUCCESS(
+            f'В ленте постов: {TimelineEntry.objects.count()}.'
+        ))
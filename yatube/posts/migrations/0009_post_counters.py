@@ -0,0 +1,54 @@
+# Generated by Django 2.2.19 on 2026-10-18 16:37
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+import django.db.models.deletion
+
+
+def fill_counters(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    for name, owner in [
+        ('AuthorPostCounter', 'author_id'),
+        ('GroupPostCounter', 'group_id'),
+    ]:
+        model = apps.get_model('posts', name)
+        totals = Post.objects.order_by().filter(
+            **{f'{owner}__isnull': False}
+        ).values_list(owner).annotate(Count('pk'))
+        model.objects.bulk_create(
+            model(**{owner: owner_id, 'post_count': total})
+            for owner_id, total in totals
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0011_update_proxy_permissions'),
+        ('posts', '0008_auto_20220520_2105'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthorPostCounter',
+            fields=[
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='GroupPostCounter',
+            fields=[
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('group', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='post_counter', serialize=False, to='posts.Group')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
 from django.contrib.auth import get_user_model
 from django.db import models
 
+from .rendering import render_text
+
 User = get_user_model()
 
 
@@ -13,9 +15,24 @@ class Group(models.Model):
         return self.title
 
 
+class PostQuerySet(models.QuerySet):
+    def feed(self):
+        """Посты для лент: автор и группа тем же запросом, без лишних полей."""
+        return self.select_related('author', 'group').only(
+            'text',
+            'pub_date',
+            'author__username',
+            'author__first_name',
+            'author__last_name',
+            'group__title',
+            'group__slug',
+        )
+
+
 class Post(models.Model):
     text = models.TextField()
     pub_date = models.DateTimeField(auto_now_add=True)
+    updated = models.DateTimeField(auto_now=True)
     author = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -28,9 +45,97 @@ class Post(models.Model):
         blank=True,
         related_name='posts'
     )
+    # Растёт при каждом сохранении, см. posts.editing.
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    objects = PostQuerySet.as_manager()
 
     class Meta:
-        ordering = ('-pub_date',)
+        ordering = ('-pub_date', '-id')
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-id'],
+                name='post_pub_date_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date', '-id'],
+                name='post_author_pub_date_idx'
+            ),
+            models.Index(
+                fields=['group', '-pub_date', '-id'],
+                name='post_group_pub_date_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.text[:15]
+
+    def save(self, *args, **kwargs):
+        if kwargs.get('update_fields'):
+            # Версию сдвигает сигнал pre_save, а время правки — auto_now;
+            # без этого save(update_fields=...) не записал бы ни то, ни другое.
+            kwargs['update_fields'] = {
+                *kwargs['update_fields'], 'version', 'updated'
+            }
+        super().save(*args, **kwargs)
+
+    @property
+    def text_html(self):
+        return render_text(self.pk, self.text)
+
+
+class TimelineEntry(models.Model):
+    """Свежие посты общей ленты: узкая копия для быстрого index."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='timeline_entry'
+    )
+    pub_date = models.DateTimeField()
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+'
+    )
+    group = models.ForeignKey(
+        Group,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+
+    class Meta:
+        ordering = ('-pub_date', '-post_id')
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-post'],
+                name='timeline_pub_date_idx'
+            ),
+        ]
+
+
+class PostCounter(models.Model):
+    post_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+
+
+class AuthorPostCounter(PostCounter):
+    author = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter'
+    )
+
+
+class GroupPostCounter(PostCounter):
+    group = models.OneToOneField(
+        Group,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='post_counter'
+    )
@@ -0,0 +1,217 @@
+import base64
+import binascii
+from collections.abc import Sequence
+
+from django.core.cache import cache
+from django.core.paginator import Page, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+from .settings import (
+    APPROXIMATE_COUNT_THRESHOLD, APPROXIMATE_COUNT_TIMEOUT,
+    PAGE_WINDOW_ON_EACH_SIDE, PAGE_WINDOW_ON_ENDS
+)
+
+NEXT = 'n'
+PREVIOUS = 'p'
+
+
+def encode_cursor(direction, post):
+    raw = f'{direction}|{post.pub_date.isoformat()}|{post.pk}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Разбирает курсор; для испорченного курсора возвращает None."""
+    try:
+        raw = base64.urlsafe_b64decode(
+            cursor + '=' * (-len(cursor) % 4)
+        ).decode()
+        direction, pub_date, pk = raw.split('|')
+        pub_date = parse_datetime(pub_date)
+        pk = int(pk)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+    if direction not in (NEXT, PREVIOUS) or pub_date is None:
+        return None
+    return direction, pub_date, pk
+
+
+class WindowedPage(Page):
+    @property
+    def page_window(self):
+        return list(self.paginator.page_window(self.number))
+
+
+class WindowedPaginator(Paginator):
+    """Paginator, который выводит не все номера страниц, а окно вокруг
+    текущей и края ленты; пропуски обозначаются ELLIPSIS.
+
+    Число ссылок на странице не зависит от числа постов в ленте.
+    """
+
+    ELLIPSIS = '…'
+
+    def page_window(self, number):
+        on_each_side = PAGE_WINDOW_ON_EACH_SIDE
+        on_ends = PAGE_WINDOW_ON_ENDS
+        number = self.validate_number(number)
+        if self.num_pages <= (on_each_side + on_ends) * 2:
+            yield from self.page_range
+            return
+        if number > on_each_side + on_ends + 2:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(number - on_each_side, number + 1)
+        else:
+            yield from range(1, number + 1)
+        if number < self.num_pages - on_each_side - on_ends - 1:
+            yield from range(number + 1, number + on_each_side + 1)
+            yield self.ELLIPSIS
+            yield from range(self.num_pages - on_ends + 1, self.num_pages + 1)
+        else:
+            yield from range(number + 1, self.num_pages + 1)
+
+    def _get_page(self, *args, **kwargs):
+        return WindowedPage(*args, **kwargs)
+
+
+class CountedPaginator(WindowedPaginator):
+    """Paginator с заранее известным числом объектов, без COUNT(*)."""
+
+    def __init__(self, object_list, per_page, known_count, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        return self.known_count
+
+
+class ApproximateCountPaginator(WindowedPaginator):
+    """Paginator, который для больших лент не считает посты точно.
+
+    Для ленты по всей таблице в PostgreSQL берётся оценка планировщика
+    (reltuples), иначе — точный счёт, закэшированный на
+    APPROXIMATE_COUNT_TIMEOUT под ключом cache_key. Приблизительным счёт
+    становится только начиная с APPROXIMATE_COUNT_THRESHOLD, а шаблон
+    тогда выводит навигацию без номеров всех страниц.
+
+    queryset — лента, по которой считаются посты; object_list может быть
+    любой последовательностью с теми же постами.
+    """
+
+    is_approximate = False
+
+    def __init__(self, object_list, per_page, queryset, cache_key, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.queryset = queryset
+        self.cache_key = f'approximate-count:{cache_key}'
+
+    def _estimate(self):
+        connection = connections[self.queryset.db]
+        if connection.vendor == 'postgresql' and not self.queryset.query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class '
+                    'WHERE oid = %s::regclass',
+                    [self.queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            if row and row[0] > 0:
+                return row[0]
+        return cache.get(self.cache_key)
+
+    @cached_property
+    def count(self):
+        estimate = self._estimate()
+        if estimate is not None and estimate >= APPROXIMATE_COUNT_THRESHOLD:
+            self.is_approximate = True
+            return estimate
+        count = self.queryset.count()
+        if count >= APPROXIMATE_COUNT_THRESHOLD:
+            cache.set(self.cache_key, count, APPROXIMATE_COUNT_TIMEOUT)
+        return count
+
+
+class CursorPage(Sequence):
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<Cursor page of {len(self.object_list)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next:
+            return encode_cursor(NEXT, self.object_list[-1])
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous:
+            return encode_cursor(PREVIOUS, self.object_list[0])
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу (pub_date, id) без COUNT и OFFSET.
+
+    Любая страница выбирается одним запросом по индексу, поэтому глубокие
+    страницы стоят столько же, сколько первая.
+    """
+
+    def __init__(self, object_list, per_page):
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    def get_page(self, cursor):
+        position = decode_cursor(cursor) if cursor else None
+        if position is None:
+            return self._page(self.object_list, NEXT, has_other=False)
+        direction, pub_date, pk = position
+        if direction == NEXT:
+            posts = self.object_list.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+        else:
+            posts = self.object_list.filter(
+                Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, pk__gt=pk)
+            )
+        page = self._page(posts, direction, has_other=True)
+        if direction == PREVIOUS and not page.has_previous():
+            # Дошли до начала ленты — отдаём первую страницу как есть.
+            return self.get_page(None)
+        return page
+
+    def _page(self, posts, direction, has_other):
+        if direction == NEXT:
+            posts = posts.order_by('-pub_date', '-pk')
+        else:
+            posts = posts.order_by('pub_date', 'pk')
+        object_list = list(posts[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if direction == NEXT:
+            return CursorPage(object_list, has_more, has_other)
+        object_list.reverse()
+        return CursorPage(object_list, has_other, has_more)
@@ -0,0 +1,22 @@
+import hashlib
+
+from django.template.defaultfilters import linebreaks_filter
+
+from core.lru import LRUCache
+
+from .settings import RENDERED_TEXT_CACHE_SIZE
+
+rendered_texts = LRUCache(RENDERED_TEXT_CACHE_SIZE)
+
+
+def render_text(post_id, text):
+    """HTML текста поста, как от фильтра linebreaks, с запоминанием.
+
+    Ключ включает хеш текста, поэтому правка поста не требует сброса.
+    """
+    key = (post_id, hashlib.blake2b(text.encode(), digest_size=16).digest())
+    html = rendered_texts.get(key)
+    if html is None:
+        html = linebreaks_filter(text, autoescape=True)
+        rendered_texts.set(key, html)
+    return html
@@ -0,0 +1,96 @@
+from django.db import connection
+from django.db.models.expressions import RawSQL
+
+from .models import Post
+
+# Полнотекстовый индекс создаётся миграцией 0012_post_search: на SQLite —
+# таблица FTS5 с триггерами, на PostgreSQL — столбец tsvector с GIN-индексом.
+QUERIES = {
+    'sqlite': {
+        'ids': (
+            'SELECT rowid FROM posts_post_fts WHERE posts_post_fts MATCH %s'
+        ),
+        'ranked': (
+            'SELECT rowid FROM posts_post_fts WHERE posts_post_fts MATCH %s '
+            'ORDER BY rank, rowid DESC LIMIT %s OFFSET %s'
+        ),
+        'count': (
+            'SELECT count(*) FROM posts_post_fts '
+            'WHERE posts_post_fts MATCH %s'
+        ),
+    },
+    'postgresql': {
+        'ids': (
+            'SELECT id FROM posts_post '
+            "WHERE search_vector @@ plainto_tsquery('russian', %s)"
+        ),
+        'ranked': (
+            'SELECT id FROM posts_post '
+            "WHERE search_vector @@ plainto_tsquery('russian', %s) "
+            "ORDER BY ts_rank(search_vector, plainto_tsquery('russian', %s)) "
+            'DESC, id DESC LIMIT %s OFFSET %s'
+        ),
+        'count': (
+            'SELECT count(*) FROM posts_post '
+            "WHERE search_vector @@ plainto_tsquery('russian', %s)"
+        ),
+    },
+}
+
+
+def _match(query):
+    """Запрос пользователя как набор слов FTS5 без операторов."""
+    if connection.vendor != 'sqlite':
+        return query
+    return ' '.join(
+        '"{}"'.format(word.replace('"', '""')) for word in query.split()
+    )
+
+
+def matching_posts(queryset, query):
+    """Сужает queryset до постов, найденных по запросу."""
+    queries = QUERIES.get(connection.vendor)
+    if queries is None:
+        return queryset.filter(text__icontains=query)
+    return queryset.filter(pk__in=RawSQL(queries['ids'], [_match(query)]))
+
+
+class SearchResults:
+    """Найденные посты по убыванию релевантности для Paginator.
+
+    Страница выбирается одним запросом к индексу с LIMIT, затем посты
+    догружаются по первичному ключу.
+    """
+
+    def __init__(self, query):
+        self.query = query
+        self.queries = QUERIES.get(connection.vendor)
+
+    def count(self):
+        if not self.query.split():
+            return 0
+        if self.queries is None:
+            return matching_posts(Post.objects.all(), self.query).count()
+        with connection.cursor() as cursor:
+            cursor.execute(self.queries['count'], [_match(self.query)])
+            return cursor.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if not self.query.split() or page.stop <= page.start:
+            return []
+        if self.queries is None:
+            return list(matching_posts(Post.objects.feed(), self.query)[page])
+        params = [_match(self.query)]
+        if connection.vendor == 'postgresql':
+            params *= 2
+        with connection.cursor() as cursor:
+            cursor.execute(
+                self.queries['ranked'],
+                params + [page.stop - page.start, page.start]
+            )
+            ids = [row[0] for row in cursor.fetchall()]
+        posts = Post.objects.feed().in_bulk(ids)
+        return [posts[pk] for pk in ids if pk in posts]
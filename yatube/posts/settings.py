@@ -1 +1,19 @@
 POSTS_PER_PAGE = 14
+# Постраничный вывод лент по курсору (pub_date, id) вместо номеров страниц.
+CURSOR_PAGINATION = False
+# Сколько секунд хранить страницы лент для анонимных пользователей.
+FEED_CACHE_TIMEOUT = 60 * 5
+# Сколько отрендеренных текстов постов держать в памяти процесса.
+RENDERED_TEXT_CACHE_SIZE = 2048
+# Сколько свежих постов держать в таблице общей ленты.
+TIMELINE_SIZE = 1000
+# Начиная с какого числа постов ленты показывают приблизительный счёт.
+APPROXIMATE_COUNT_THRESHOLD = 10_000
+# Сколько секунд хранить точный счёт большой ленты.
+APPROXIMATE_COUNT_TIMEOUT = 60 * 10
+# Сколько соседних страниц показывать по бокам от текущей и у краёв.
+PAGE_WINDOW_ON_EACH_SIDE = 2
+PAGE_WINDOW_ON_ENDS = 1
+# Сколько групп и авторов держать в памяти процесса и сколько секунд.
+LOOKUP_CACHE_SIZE = 1024
+LOOKUP_CACHE_TTL = 60
@@ -0,0 +1,86 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import GROUPS, author_scope, bump_feeds_on_commit, group_scope
+from .lookups import forget_author, forget_group
+from .models import Group, Post, User
+from .tasks import feed_scopes, record_post_write
+
+
+@receiver(pre_save, sender=Post)
+def remember_post_owners(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding:
+        instance._saved_owners = None
+        return
+    # Правка через save() тоже должна разойтись с открытыми формами.
+    # Прежние владельцы читаются без блокировки: формы правят пост через
+    # save_post_edit с проверкой версии, а счётчики после одновременных
+    # save() одного поста сверяет rebuild_counters.
+    instance.version += 1
+    instance._saved_owners = Post.objects.filter(pk=instance.pk).values_list(
+        'author_id', 'group_id'
+    ).first()
+
+
+@receiver(post_save, sender=Post)
+def sync_saved_post(sender, instance, created, raw, **kwargs):
+    if raw:
+        return
+    record_post_write(
+        instance.pk, None if created else instance._saved_owners,
+        (instance.author_id, instance.group_id)
+    )
+
+
+@receiver(post_delete, sender=Post)
+def sync_deleted_post(sender, instance, **kwargs):
+    record_post_write(
+        instance.pk, (instance.author_id, instance.group_id), None
+    )
+
+
+@receiver(pre_save, sender=Group)
+def forget_renamed_group(sender, instance, raw, **kwargs):
+    if raw or instance._state.adding:
+        return
+    slugs = Group.objects.filter(pk=instance.pk).exclude(
+        slug=instance.slug
+    ).values_list('slug', flat=True)
+    forget_group(*slugs)
+    bump_feeds_on_commit(*map(group_scope, slugs))
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+def forget_changed_group(sender, instance, **kwargs):
+    forget_group(instance.slug)
+    bump_feeds_on_commit(group_scope(instance.slug), GROUPS)
+
+
+@receiver(pre_save, sender=User)
+def forget_renamed_author(sender, instance, raw, update_fields, **kwargs):
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and 'username' not in update_fields:
+        # Например, вход пользователя обновляет только last_login.
+        return
+    old_usernames = list(User.objects.filter(pk=instance.pk).exclude(
+        username=instance.username
+    ).values_list('username', flat=True))
+    if not old_usernames:
+        return
+    forget_author(*old_usernames)
+    # Имя автора видно на общей ленте, его профиле и лентах его групп.
+    group_ids = Post.objects.filter(author_id=instance.pk).values_list(
+        'group_id', flat=True
+    ).distinct()
+    bump_feeds_on_commit(
+        *feed_scopes([instance.pk], group_ids),
+        author_scope(instance.username)
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_changed_author(sender, instance, **kwargs):
+    forget_author(instance.username)
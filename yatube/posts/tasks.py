@@ -0,0 +1,67 @@
+from collections import Counter
+
+from django.db import transaction
+
+from core.tasks import task
+
+from .cache import INDEX, author_scope, bump_feeds_on_commit, group_scope
+from .counters import change_author_count, change_group_count
+from .models import Group, User
+from .timeline import sync_timeline
+
+
+def feed_scopes(author_ids, group_ids):
+    """Ленты, на которых виден пост с такими авторами и группами."""
+    return [INDEX] + [
+        author_scope(username) for username in User.objects.filter(
+            pk__in=author_ids
+        ).values_list('username', flat=True)
+    ] + [
+        group_scope(slug) for slug in Group.objects.filter(
+            pk__in=group_ids
+        ).values_list('slug', flat=True)
+    ]
+
+
+def owner_deltas(before, after):
+    """На сколько меняются счётчики авторов и групп при записи поста.
+
+    before и after — пары (author_id, group_id) поста до и после записи,
+    None — поста не было или больше нет. Владельцы без изменения
+    остаются с нулём: их ленты всё равно нужно сбросить.
+    """
+    authors, groups = Counter(), Counter()
+    for pair, delta in ((before, -1), (after, 1)):
+        if pair is None:
+            continue
+        author_id, group_id = pair
+        authors[author_id] += delta
+        if group_id is not None:
+            groups[group_id] += delta
+    return authors, groups
+
+
+def record_post_write(post_id, before, after):
+    """Сдвигает счётчики в транзакции записи поста и ставит sync_post.
+
+    Счётчики задают число постов для постраничного вывода профиля и
+    группы, поэтому не ждут задачи: пост виден там сразу после фиксации.
+    """
+    authors, groups = owner_deltas(before, after)
+    with transaction.atomic():
+        for author_id, delta in authors.items():
+            change_author_count(author_id, delta)
+        for group_id, delta in groups.items():
+            change_group_count(group_id, delta)
+        sync_post.delay(post_id, sorted(authors), sorted(groups))
+
+
+@task
+def sync_post(post_id, author_ids, group_ids):
+    """Общая лента и кэш лент после записи или удаления поста.
+
+    author_ids и group_ids — владельцы поста до и после записи. Лента
+    сверяется с постом, поэтому повтор безопасен.
+    """
+    sync_timeline(post_id)
+    bump_feeds_on_commit(*feed_scopes(author_ids, group_ids))
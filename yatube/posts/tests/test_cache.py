@@ -0,0 +1,145 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, TestCase, override_settings
+from django.urls import reverse
+
+from ..cache import INDEX, cache_feed
+from ..models import Group, Post, User
+
+USERNAME = 'author'
+USERNAME_2 = 'author2'
+SLUG_OF_GROUP = 'group1'
+SLUG_OF_GROUP_2 = 'group2'
+URL_OF_INDEX = reverse('posts:index')
+URL_OF_POSTS_OF_GROUP = reverse('posts:group_list', args=[SLUG_OF_GROUP])
+URL_OF_POSTS_OF_GROUP_2 = reverse('posts:group_list', args=[SLUG_OF_GROUP_2])
+URL_OF_PROFILE = reverse('posts:profile', args=[USERNAME])
+URL_OF_PROFILE_2 = reverse('posts:profile', args=[USERNAME_2])
+FEEDS = [
+    URL_OF_INDEX,
+    URL_OF_POSTS_OF_GROUP,
+    URL_OF_POSTS_OF_GROUP_2,
+    URL_OF_PROFILE,
+    URL_OF_PROFILE_2,
+]
+
+
+class FeedCacheTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.user_2 = User.objects.create_user(username=USERNAME_2)
+        cls.group = Group.objects.create(title='Группа 1', slug=SLUG_OF_GROUP)
+        cls.group_2 = Group.objects.create(
+            title='Группа 2', slug=SLUG_OF_GROUP_2
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Первый пост', group=cls.group
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def pages(self):
+        return {url: self.guest_client.get(url).content for url in FEEDS}
+
+    def changed(self, before):
+        after = self.pages()
+        return {url for url in FEEDS if before[url] != after[url]}
+
+    def test_anonymous_pages_are_cached(self):
+        before = self.pages()
+        Post.objects.filter(pk=self.post.pk).update(text='Мимо сигналов')
+        self.assertEqual(self.changed(before), set())
+        response = self.authorized_client.get(URL_OF_INDEX)
+        self.assertContains(response, 'Мимо сигналов')
+
+    def test_new_post_invalidates_only_its_feeds(self):
+        """Новый пост сбрасывает общую ленту, ленты автора и группы."""
+        before = self.pages()
+        Post.objects.create(
+            author=self.user_2, text='Второй пост', group=self.group_2
+        )
+        self.assertEqual(
+            self.changed(before),
+            {URL_OF_INDEX, URL_OF_POSTS_OF_GROUP_2, URL_OF_PROFILE_2}
+        )
+
+    def test_edit_and_delete_invalidate_old_and_new_feeds(self):
+        before = self.pages()
+        self.post.group = self.group_2
+        self.post.save()
+        self.assertEqual(
+            self.changed(before),
+            {
+                URL_OF_INDEX,
+                URL_OF_POSTS_OF_GROUP,
+                URL_OF_POSTS_OF_GROUP_2,
+                URL_OF_PROFILE,
+            }
+        )
+        before = self.pages()
+        self.post.delete()
+        self.assertEqual(
+            self.changed(before),
+            {URL_OF_INDEX, URL_OF_POSTS_OF_GROUP_2, URL_OF_PROFILE}
+        )
+
+    def test_group_change_invalidates_pages_showing_it(self):
+        before = self.pages()
+        self.group.title = 'Новое название'
+        self.group.save()
+        self.assertEqual(
+            self.changed(before),
+            {URL_OF_INDEX, URL_OF_POSTS_OF_GROUP, URL_OF_PROFILE}
+        )
+
+    def test_author_rename_invalidates_pages_showing_it(self):
+        before = self.pages()
+        self.user.username = 'renamed'
+        self.user.save()
+        self.addCleanup(setattr, self.user, 'username', USERNAME)
+        self.assertEqual(
+            self.changed(before),
+            {URL_OF_INDEX, URL_OF_POSTS_OF_GROUP, URL_OF_PROFILE}
+        )
+
+    def test_cached_page_keeps_headers(self):
+        @cache_feed(INDEX)
+        def view(request):
+            response = HttpResponse('страница', content_type='text/plain')
+            response['Vary'] = 'Accept-Language'
+            return response
+
+        request = RequestFactory().get('/')
+        request.user = AnonymousUser()
+        fresh, cached = view(request), view(request)
+        self.assertEqual(cached.content, fresh.content)
+        self.assertEqual(cached['Content-Type'], 'text/plain')
+        self.assertEqual(cached['Vary'], 'Accept-Language')
+
+
+class FileBasedFeedCacheTest(FeedCacheTest):
+    @classmethod
+    def setUpClass(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.cache_settings = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': cls.cache_dir,
+        }})
+        cls.cache_settings.enable()
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.cache_settings.disable()
+        shutil.rmtree(cls.cache_dir, ignore_errors=True)
@@ -0,0 +1,81 @@
+from django.core.cache import cache
+from django.test import Client, TestCase
+from django.urls import reverse
+from django.utils.http import http_date
+
+from ..models import Group, Post, User
+
+USERNAME = 'author'
+SLUG_OF_GROUP = 'group1'
+URL_OF_INDEX = reverse('posts:index')
+URL_OF_POSTS_OF_GROUP = reverse('posts:group_list', args=[SLUG_OF_GROUP])
+URL_OF_PROFILE = reverse('posts:profile', args=[USERNAME])
+
+
+class ConditionalGetTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(title='Группа 1', slug=SLUG_OF_GROUP)
+        cls.post = Post.objects.create(
+            author=cls.user, text='Первый пост', group=cls.group
+        )
+        cls.URL_OF_DETAIL_POST = reverse(
+            'posts:post_detail', args=[cls.post.pk]
+        )
+        cls.URLS = [
+            URL_OF_INDEX,
+            URL_OF_POSTS_OF_GROUP,
+            URL_OF_PROFILE,
+            cls.URL_OF_DETAIL_POST,
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.guest_client = Client()
+        self.authorized_client = Client()
+        self.authorized_client.force_login(self.user)
+
+    def revalidate(self, client, url, response):
+        return client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_not_modified_skips_rendering(self):
+        for client in [self.guest_client, self.authorized_client]:
+            for url in self.URLS:
+                with self.subTest(url=url):
+                    response = client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertNotIn('Last-Modified', response)
+                    repeated = self.revalidate(client, url, response)
+                    self.assertEqual(repeated.status_code, 304)
+                    self.assertEqual(repeated.content, b'')
+                    self.assertIsNone(repeated.context)
+
+    def test_etag_differs_between_users(self):
+        for url in self.URLS:
+            with self.subTest(url=url):
+                response = self.guest_client.get(url)
+                self.assertEqual(self.revalidate(
+                    self.authorized_client, url, response
+                ).status_code, 200)
+
+    def test_edit_changes_etag(self):
+        responses = {url: self.guest_client.get(url) for url in self.URLS}
+        post = Post.objects.get(pk=self.post.pk)
+        post.text = 'Исправленный пост'
+        post.save()
+        for url, response in responses.items():
+            with self.subTest(url=url):
+                repeated = self.revalidate(self.guest_client, url, response)
+                self.assertEqual(repeated.status_code, 200)
+                self.assertContains(repeated, 'Исправленный пост')
+
+    def test_if_modified_since_alone_is_not_trusted(self):
+        """Без Last-Modified правка не прячется за 304 по дате."""
+        for url in self.URLS:
+            with self.subTest(url=url):
+                response = self.guest_client.get(
+                    url, HTTP_IF_MODIFIED_SINCE=http_date()
+                )
+                self.assertEqual(response.status_code, 200)
@@ -0,0 +1,55 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..counters import author_post_count, group_post_count
+from ..models import AuthorPostCounter, Group, Post, User
+
+
+class PostCountersTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.user_2 = User.objects.create_user(username='auth2')
+        cls.group = Group.objects.create(title='Группа 1', slug='group1')
+        cls.group_2 = Group.objects.create(title='Группа 2', slug='group2')
+
+    def assertCounts(self, author, group, group_2):
+        self.assertEqual(author_post_count(self.user.pk), author)
+        self.assertEqual(group_post_count(self.group.pk), group)
+        self.assertEqual(group_post_count(self.group_2.pk), group_2)
+
+    def test_create_edit_delete(self):
+        """Счётчики следуют за созданием, переносом и удалением поста."""
+        post = Post.objects.create(
+            author=self.user, text='Текст', group=self.group
+        )
+        Post.objects.create(author=self.user, text='Текст')
+        self.assertCounts(2, 1, 0)
+        post.text = 'Новый текст'
+        post.save()
+        self.assertCounts(2, 1, 0)
+        post.group = self.group_2
+        post.save()
+        self.assertCounts(2, 0, 1)
+        post.author = self.user_2
+        post.save()
+        self.assertCounts(1, 0, 1)
+        self.assertEqual(author_post_count(self.user_2.pk), 1)
+        post.delete()
+        self.assertCounts(1, 0, 0)
+        self.assertEqual(author_post_count(self.user_2.pk), 0)
+
+    def test_rebuild_command(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text='Текст', group=self.group)
+            for _ in range(3)
+        )
+        AuthorPostCounter.objects.update_or_create(
+            author=self.user_2, defaults={'post_count': 5}
+        )
+        call_command('rebuild_post_counters', stdout=StringIO())
+        self.assertCounts(3, 3, 0)
+        self.assertEqual(author_post_count(self.user_2.pk), 0)
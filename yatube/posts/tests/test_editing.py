@@ -0,0 +1,136 @@
+from django.db import connection
+from django.test import Client, TestCase, override_settings
+from django.urls import reverse
+
+from core.models import Task
+
+from ..counters import group_post_count
+from ..editing import EDIT_CONFLICT
+from ..models import Group, Post, TimelineEntry, User
+from ..tasks import sync_post
+
+
+class PostEditTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.other = User.objects.create_user(username='other')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        cls.group_2 = Group.objects.create(title='Группа 2', slug='group-2')
+
+    def setUp(self):
+        self.post = Post.objects.create(
+            author=self.user, text='Тестовый пост', group=self.group
+        )
+        self.url = reverse('posts:post_edit', args=[self.post.pk])
+        self.client = Client()
+        self.client.force_login(self.user)
+
+    def edit(self, client=None, **data):
+        client = client or self.client
+        state = client.get(self.url).context['edit_state']
+        return lambda: client.post(self.url, {
+            'text': self.post.text,
+            'group': self.post.group_id,
+            'edit_state': state,
+            **data,
+        })
+
+    @override_settings(TASKS_EAGER=False)
+    def test_text_edit_is_one_update_of_changed_fields(self):
+        submit = self.edit(text='Новый текст')
+        executed = []
+
+        def record(execute, sql, params, many, context):
+            executed.append(sql)
+            return execute(sql, params, many, context)
+
+        # Тестовый клиент сбрасывает connection.queries в начале запроса.
+        with connection.execute_wrapper(record):
+            response = submit()
+        self.assertRedirects(
+            response, reverse('posts:post_detail', args=[self.post.pk])
+        )
+        post_queries = [sql for sql in executed if '"posts_post"' in sql]
+        self.assertEqual(len(post_queries), 1)
+        self.assertTrue(post_queries[0].startswith('UPDATE'))
+        self.assertIn('"text"', post_queries[0])
+        self.assertNotIn('"group_id"', post_queries[0])
+        self.assertNotIn('"pub_date"', post_queries[0])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Новый текст')
+        self.assertEqual(self.post.version, 2)
+        self.assertTrue(
+            Task.objects.filter(name=sync_post.task_name).exists()
+        )
+
+    def test_group_edit_moves_counters_and_timeline(self):
+        self.edit(group=self.group_2.pk)()
+        self.assertEqual(group_post_count(self.group.pk), 0)
+        self.assertEqual(group_post_count(self.group_2.pk), 1)
+        self.assertEqual(
+            TimelineEntry.objects.get(post_id=self.post.pk).group_id,
+            self.group_2.pk
+        )
+
+    def test_concurrent_edit_is_conflict(self):
+        submit = self.edit(text='Устаревшая правка')
+        self.post.text = 'Правка из другой вкладки'
+        self.post.save()
+        response = submit()
+        self.assertEqual(response.status_code, 409)
+        self.assertContains(response, EDIT_CONFLICT, status_code=409)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Правка из другой вкладки')
+        resubmit = response.context['edit_state']
+        self.client.post(self.url, {
+            'text': 'Устаревшая правка', 'edit_state': resubmit
+        })
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Устаревшая правка')
+
+    def test_other_user_cannot_edit(self):
+        submit = self.edit(text='Чужая правка')
+        other = Client()
+        other.force_login(self.other)
+        response = other.post(self.url, {
+            'text': 'Чужая правка',
+            'edit_state': self.client.get(self.url).context['edit_state'],
+        })
+        self.assertRedirects(
+            response, reverse('posts:post_detail', args=[self.post.pk])
+        )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Тестовый пост')
+        self.assertEqual(submit().status_code, 302)
+
+    def test_invalid_form_checks_post_and_author(self):
+        missing = reverse('posts:post_edit', args=[self.post.pk + 1000])
+        self.assertEqual(
+            self.client.post(missing, {'text': ''}).status_code, 404
+        )
+        other = Client()
+        other.force_login(self.other)
+        self.assertRedirects(
+            other.post(self.url, {'text': ''}),
+            reverse('posts:post_detail', args=[self.post.pk])
+        )
+
+    def test_state_of_other_post_is_rejected(self):
+        other_post = Post.objects.create(author=self.user, text='Другой пост')
+        state = self.client.get(
+            reverse('posts:post_edit', args=[other_post.pk])
+        ).context['edit_state']
+        response = self.client.post(self.url, {
+            'text': 'Другой пост', 'edit_state': state
+        })
+        self.assertEqual(response.status_code, 409)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.text, 'Тестовый пост')
+
+    def test_save_with_update_fields_moves_version(self):
+        self.post.text = 'Правка одного поля'
+        self.post.save(update_fields=['text'])
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.version, 2)
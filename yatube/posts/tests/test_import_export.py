@@ -0,0 +1,128 @@
+import json
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from ..counters import author_post_count, group_post_count
+from ..models import Group, Post, TimelineEntry, User
+
+
+class ImportExportTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='author')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+        for number in range(5):
+            Post.objects.create(
+                author=cls.user,
+                text=f'Пост {number},\n"в кавычках"',
+                group=cls.group if number % 2 else None,
+            )
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def snapshot(self):
+        return list(Post.objects.order_by('pk').values_list(
+            'text', 'pub_date', 'author__username', 'group__slug'
+        ))
+
+    def export(self, name, *args):
+        path = os.path.join(self.directory, name)
+        call_command('posts_export', path, *args, stderr=StringIO())
+        return path
+
+    def load(self, path, *args):
+        call_command(
+            'posts_import', path, *args, stdout=StringIO(), stderr=StringIO()
+        )
+
+    def test_round_trip(self):
+        """Выгрузка и загрузка сохраняют тексты, даты, авторов и группы."""
+        for name, args in [
+            ('posts.ndjson', []),
+            ('posts.csv', ['--format', 'csv']),
+        ]:
+            with self.subTest(name=name):
+                expected = self.snapshot()
+                path = self.export(name, *args)
+                Post.objects.all().delete()
+                self.load(path, '--batch-size', '2')
+                self.assertEqual(self.snapshot(), expected)
+                self.assertEqual(author_post_count(self.user.pk), 5)
+                self.assertEqual(group_post_count(self.group.pk), 2)
+
+    def test_unknown_authors_and_groups_are_created(self):
+        path = self.export('posts.ndjson')
+        Post.objects.all().delete()
+        User.objects.filter(pk=self.user.pk).update(username='renamed')
+        Group.objects.filter(pk=self.group.pk).update(slug='renamed')
+        self.load(path)
+        author = User.objects.get(username='author')
+        self.assertFalse(author.has_usable_password())
+        self.assertEqual(author.posts.count(), 5)
+        self.assertEqual(Group.objects.get(slug='group').posts.count(), 2)
+
+    def test_resume_after_failure(self):
+        path = self.export('posts.ndjson', '--after-id', '0')
+        expected = self.snapshot()
+        Post.objects.all().delete()
+        original = Post.objects.bulk_create
+        calls = []
+
+        def failing_bulk_create(objs, *args, **kwargs):
+            calls.append(objs)
+            if len(calls) == 2:
+                raise RuntimeError('Сбой')
+            return original(objs, *args, **kwargs)
+
+        with patch.object(
+            type(Post.objects), 'bulk_create', side_effect=failing_bulk_create
+        ), self.assertRaises(RuntimeError):
+            self.load(path, '--batch-size', '2')
+        self.assertEqual(Post.objects.count(), 2)
+        # Лента уже показывает загруженную пачку, не дожидаясь конца.
+        self.assertEqual(
+            set(TimelineEntry.objects.values_list('post_id', flat=True)),
+            set(Post.objects.values_list('pk', flat=True))
+        )
+        self.load(path, '--batch-size', '2', '--resume')
+        self.assertEqual(self.snapshot(), expected)
+        self.assertFalse(os.path.exists(f'{path}.checkpoint'))
+
+    def test_keep_ids(self):
+        ids = list(Post.objects.order_by('pk').values_list('pk', flat=True))
+        path = self.export('posts.ndjson')
+        Post.objects.all().delete()
+        self.load(path, '--keep-ids')
+        self.assertEqual(
+            list(Post.objects.order_by('pk').values_list('pk', flat=True)),
+            ids
+        )
+        self.assertGreater(
+            Post.objects.create(author=self.user, text='Новый').pk, max(ids)
+        )
+
+    @patch('posts.timeline.TIMELINE_SIZE', 2)
+    def test_archive_batches_skip_full_timeline(self):
+        path = os.path.join(self.directory, 'archive.ndjson')
+        with open(path, 'w') as file:
+            for year in (2001, 2002, 2099):
+                file.write(json.dumps({
+                    'text': f'Пост {year} года',
+                    'pub_date': f'{year}-01-01T00:00:00+00:00',
+                    'author': 'author',
+                    'group': '',
+                }) + '\n')
+        with patch(
+            'posts.management.commands.posts_import.rebuild_timeline'
+        ) as rebuild:
+            self.load(path, '--batch-size', '2')
+        self.assertEqual(rebuild.call_count, 1)
@@ -0,0 +1,72 @@
+from django.db import transaction
+from django.http import Http404
+from django.test import TransactionTestCase
+
+from ..lookups import LOOKUPS, authors, get_author, get_group, groups
+from ..models import Group, User
+
+
+class LookupCacheTest(TransactionTestCase):
+    # Кэш заполняется после фиксации транзакции, а TestCase её откатывает.
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='auth')
+        self.group = Group.objects.create(title='Группа', slug='group')
+        groups.clear()
+        authors.clear()
+
+    def test_repeated_lookup_is_memoized(self):
+        hits, misses = LOOKUPS.value('group_hit'), LOOKUPS.value('group_miss')
+        self.assertEqual(get_group('group'), self.group)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_group('group'), self.group)
+        self.assertEqual(LOOKUPS.value('group_hit'), hits + 1)
+        self.assertEqual(LOOKUPS.value('group_miss'), misses + 1)
+
+    def test_missing_objects_are_not_memoized(self):
+        for _ in range(2):
+            with self.assertRaises(Http404):
+                get_author('nobody')
+        self.assertEqual(len(authors), 0)
+
+    def test_group_change_drops_entry(self):
+        get_group('group')
+        self.group.title = 'Новое название'
+        self.group.save()
+        self.assertEqual(get_group('group').title, 'Новое название')
+        self.group.slug = 'renamed'
+        self.group.save()
+        with self.assertRaises(Http404):
+            get_group('group')
+        self.group.delete()
+        with self.assertRaises(Http404):
+            get_group('renamed')
+
+    def test_author_change_drops_entry(self):
+        get_author('auth')
+        self.user.username = 'renamed'
+        self.user.save()
+        with self.assertRaises(Http404):
+            get_author('auth')
+        get_author('renamed')
+        self.user.delete()
+        with self.assertRaises(Http404):
+            get_author('renamed')
+
+    def test_author_entry_keeps_only_rendered_fields(self):
+        author = get_author('auth')
+        self.assertEqual(author, self.user)
+        self.assertEqual(authors.get('auth'), (self.user.pk, 'auth', '', ''))
+        self.assertIn('password', author.get_deferred_fields())
+        with self.assertNumQueries(0):
+            self.assertEqual(get_author('auth').username, 'auth')
+
+    def test_rolled_back_lookup_is_not_memoized(self):
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            get_author('auth')
+            raise RuntimeError
+        self.assertEqual(len(authors), 0)
+        with transaction.atomic():
+            get_author('auth')
+            self.assertEqual(len(authors), 0)
+        self.assertEqual(len(authors), 1)
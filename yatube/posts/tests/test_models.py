@@ -1,6 +1,10 @@
+from unittest.mock import patch
+
+from django.template import Context, Template
 from django.test import TestCase
 
 from ..models import Group, Post, User
+from ..rendering import rendered_texts
 
 
 class PostModelTest(TestCase):
@@ -23,3 +27,37 @@ class PostModelTest(TestCase):
         """Проверяем, что у моделей корректно работает __str__."""
         self.assertEqual(self.group.title, str(self.group))
         self.assertEqual(self.post.text[:15], str(self.post))
+
+    def test_feeds_use_indexes(self):
+        """Страницы лент выбираются по составным индексам без сортировки."""
+        cases = [
+            [Post.objects.feed(), 'post_pub_date_idx'],
+            [self.user.posts.feed(), 'post_author_pub_date_idx'],
+            [self.group.posts.feed(), 'post_group_pub_date_idx'],
+        ]
+        for feed, index in cases:
+            with self.subTest(index=index):
+                plan = feed[:10].explain()
+                self.assertIn(index, plan)
+                self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_text_html_matches_linebreaks(self):
+        """Запомненный HTML совпадает с выводом фильтра linebreaks."""
+        post = Post(pk=1, text='Строка <b>1</b>\nСтрока 2\n\nАбзац & ещё')
+        self.assertEqual(
+            Template('{{ post.text_html }}').render(Context({'post': post})),
+            Template('{{ post.text|linebreaks }}').render(Context({
+                'post': post
+            }))
+        )
+
+    def test_text_html_is_rendered_once(self):
+        rendered_texts.clear()
+        post = Post(pk=1, text='Текст')
+        with patch('posts.rendering.linebreaks_filter') as render:
+            render.return_value = '<p>HTML</p>'
+            for _ in range(3):
+                self.assertEqual(post.text_html, '<p>HTML</p>')
+            post.text = 'Новый текст'
+            self.assertEqual(post.text_html, '<p>HTML</p>')
+        self.assertEqual(render.call_count, 2)
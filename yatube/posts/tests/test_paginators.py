@@ -0,0 +1,33 @@
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from ..paginators import WindowedPaginator
+
+ELLIPSIS = WindowedPaginator.ELLIPSIS
+
+
+@patch('posts.paginators.PAGE_WINDOW_ON_EACH_SIDE', 2)
+@patch('posts.paginators.PAGE_WINDOW_ON_ENDS', 1)
+class WindowedPaginatorTest(SimpleTestCase):
+    def window(self, pages, number):
+        return list(WindowedPaginator(range(pages), 1).page_window(number))
+
+    def test_short_feed_shows_all_pages(self):
+        self.assertEqual(self.window(6, 3), [1, 2, 3, 4, 5, 6])
+
+    def test_window_around_current_page(self):
+        cases = {
+            1: [1, 2, 3, ELLIPSIS, 100],
+            5: [1, 2, 3, 4, 5, 6, 7, ELLIPSIS, 100],
+            50: [1, ELLIPSIS, 48, 49, 50, 51, 52, ELLIPSIS, 100],
+            100: [1, ELLIPSIS, 98, 99, 100],
+        }
+        for number, window in cases.items():
+            with self.subTest(number=number):
+                self.assertEqual(self.window(100, number), window)
+
+    def test_window_size_does_not_depend_on_pages(self):
+        self.assertEqual(
+            len(self.window(100, 50)), len(self.window(100_000, 50_000))
+        )
@@ -0,0 +1,81 @@
+from django.test import Client, TestCase
+from django.urls import reverse
+
+from ..models import Post, User
+from ..search import SearchResults
+from ..settings import POSTS_PER_PAGE
+
+URL_OF_SEARCH = reverse('posts:search')
+URL_OF_ADMIN_SEARCH = reverse('admin:posts_post_changelist')
+
+
+class SearchTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_superuser(
+            username='admin', email='admin@example.com', password='pass'
+        )
+        cls.post = Post.objects.create(
+            author=cls.user, text='Кошка спит на диване'
+        )
+        cls.post_2 = Post.objects.create(
+            author=cls.user, text='Собака и кошка, кошка и собака'
+        )
+
+    def setUp(self):
+        self.guest_client = Client()
+        self.admin_client = Client()
+        self.admin_client.force_login(self.user)
+
+    def found(self, query):
+        results = SearchResults(query)
+        return [post.pk for post in results[0:results.count()]]
+
+    def test_triggers_keep_index_in_sync(self):
+        """Индекс следует за созданием, правкой и удалением постов."""
+        post = Post.objects.create(author=self.user, text='Жираф в саванне')
+        self.assertEqual(self.found('жираф'), [post.pk])
+        post.text = 'Слон в саванне'
+        post.save()
+        self.assertEqual(self.found('жираф'), [])
+        self.assertEqual(self.found('слон'), [post.pk])
+        Post.objects.filter(pk=post.pk).update(text='Носорог в саванне')
+        self.assertEqual(self.found('носорог'), [post.pk])
+        post.delete()
+        self.assertEqual(self.found('саванне'), [])
+
+    def test_results_are_ranked(self):
+        self.assertEqual(self.found('кошка'), [self.post_2.pk, self.post.pk])
+        self.assertEqual(self.found('кошка диване'), [self.post.pk])
+
+    def test_query_syntax_is_not_interpreted(self):
+        for query in ['"', 'кошка OR', 'NEAR(', '*', '   ']:
+            with self.subTest(query=query):
+                self.assertEqual(
+                    self.guest_client.get(
+                        URL_OF_SEARCH, {'q': query}
+                    ).status_code,
+                    200
+                )
+
+    def test_search_view_paginates(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text=f'Пингвин номер {number}')
+            for number in range(POSTS_PER_PAGE + 1)
+        )
+        response = self.guest_client.get(URL_OF_SEARCH, {'q': 'пингвин'})
+        page = response.context['page_obj']
+        self.assertEqual(page.paginator.count, POSTS_PER_PAGE + 1)
+        self.assertEqual(len(page), POSTS_PER_PAGE)
+        self.assertContains(response, '?q=%D0%BF%D0%B8%D0%BD%D0%B3%D0%B2')
+        response = self.guest_client.get(
+            URL_OF_SEARCH, {'q': 'пингвин', 'page': 2}
+        )
+        self.assertEqual(len(response.context['page_obj']), 1)
+
+    def test_admin_search(self):
+        response = self.admin_client.get(URL_OF_ADMIN_SEARCH, {'q': 'диване'})
+        self.assertEqual(
+            list(response.context['cl'].result_list), [self.post]
+        )
@@ -0,0 +1,67 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from core.models import Task
+from core.tasks import _run, run_due_tasks
+
+from ..counters import author_post_count, group_post_count
+from ..models import Group, Post, TimelineEntry, User
+
+
+@override_settings(TASKS_EAGER=False)
+class DeferredSideEffectsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+
+    def test_counters_change_with_post_timeline_waits_for_task(self):
+        post = Post.objects.create(
+            author=self.user, text='Пост', group=self.group
+        )
+        self.assertEqual(author_post_count(self.user.pk), 1)
+        self.assertEqual(group_post_count(self.group.pk), 1)
+        self.assertFalse(TimelineEntry.objects.exists())
+        run_due_tasks()
+        self.assertTrue(TimelineEntry.objects.filter(post=post).exists())
+        post.delete()
+        self.assertEqual(author_post_count(self.user.pk), 0)
+        self.assertEqual(group_post_count(self.group.pk), 0)
+        run_due_tasks()
+        self.assertFalse(TimelineEntry.objects.exists())
+
+    def test_new_post_is_on_profile_before_task_runs(self):
+        self.client.force_login(self.user)
+        response = self.client.post(
+            reverse('posts:post_create'), {'text': 'Свежий пост'},
+            follow=True
+        )
+        self.assertTrue(Task.objects.exists())
+        self.assertEqual(len(response.context['page_obj']), 1)
+        self.assertContains(response, 'Свежий пост')
+
+    def test_counters_move_without_recount(self):
+        post = Post.objects.create(author=self.user, text='Пост')
+        run_due_tasks()
+        post.group = self.group
+        with CaptureQueriesContext(connection) as queries:
+            post.save()
+            run_due_tasks()
+        self.assertFalse(any(
+            'COUNT(' in query['sql'] for query in queries.captured_queries
+        ))
+        self.assertEqual(author_post_count(self.user.pk), 1)
+        self.assertEqual(group_post_count(self.group.pk), 1)
+
+    def test_task_run_twice_changes_nothing_more(self):
+        """Исполнитель после истёкшей аренды не трогает счётчики и ленту."""
+        Post.objects.create(author=self.user, text='Пост', group=self.group)
+        queued = Task.objects.values_list('pk', 'name', 'args').get()
+        for _ in range(2):
+            _run(*queued)
+        self.assertEqual(author_post_count(self.user.pk), 1)
+        self.assertEqual(group_post_count(self.group.pk), 1)
+        self.assertEqual(TimelineEntry.objects.count(), 1)
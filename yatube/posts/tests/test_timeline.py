@@ -0,0 +1,80 @@
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.core.paginator import Paginator
+from django.test import TestCase
+
+from ..models import Group, Post, TimelineEntry, User
+from ..timeline import TimelineFeed
+
+TIMELINE_SIZE = 3
+
+
+@patch('posts.timeline.TIMELINE_SIZE', TIMELINE_SIZE)
+class TimelineTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username='auth')
+        cls.group = Group.objects.create(title='Группа', slug='group')
+
+    def create_posts(self, count):
+        return [
+            Post.objects.create(author=self.user, text=f'Пост {number}')
+            for number in range(count)
+        ]
+
+    def timeline(self):
+        return list(TimelineEntry.objects.values_list('post_id', flat=True))
+
+    def newest(self):
+        return list(
+            Post.objects.values_list('pk', flat=True)[:TIMELINE_SIZE]
+        )
+
+    def test_keeps_newest_posts(self):
+        self.create_posts(TIMELINE_SIZE + 2)
+        self.assertEqual(self.timeline(), self.newest())
+
+    def test_refills_after_delete(self):
+        posts = self.create_posts(TIMELINE_SIZE + 2)
+        posts[-1].delete()
+        self.assertEqual(self.timeline(), self.newest())
+
+    def test_follows_group_change(self):
+        post, = self.create_posts(1)
+        post.group = self.group
+        post.save()
+        self.assertEqual(
+            TimelineEntry.objects.get(post=post).group_id, self.group.pk
+        )
+
+    def test_pages_match_post_feed(self):
+        self.create_posts(TIMELINE_SIZE + 2)
+        for number in (1, 2, 3):
+            with self.subTest(page=number):
+                self.assertEqual(
+                    list(Paginator(
+                        TimelineFeed(Post.objects.feed()), 2
+                    ).page(number)),
+                    list(Paginator(Post.objects.feed(), 2).page(number)),
+                )
+
+    def test_timeline_page_reads_entries_and_posts_once(self):
+        self.create_posts(TIMELINE_SIZE)
+        feed = TimelineFeed(Post.objects.feed())
+        with self.assertNumQueries(2):
+            posts = feed[0:TIMELINE_SIZE]
+        self.assertEqual([post.pk for post in posts], self.newest())
+
+    def test_bulk_created_posts_fall_back_and_rebuild(self):
+        Post.objects.bulk_create(
+            Post(author=self.user, text='Текст') for _ in range(2)
+        )
+        self.assertEqual(
+            TimelineFeed(Post.objects.feed())[0:2],
+            list(Post.objects.feed()[0:2])
+        )
+        call_command('rebuild_timeline', stdout=StringIO())
+        self.assertEqual(self.timeline(), self.newest()[:2])
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase, Client
 from django.urls import reverse
 
@@ -39,6 +40,7 @@ class PostURLTests(TestCase):
         cls.LOGIN_URL_EDIT = f'{LOGIN_URL}{URL_NEXT}{cls.URL_TO_EDIT_POST}'
 
     def setUp(self):
+        cache.clear()
         self.guest = Client()
         self.another = Client()
         self.another_2 = Client()
@@ -1,8 +1,16 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
+from ..counters import rebuild_counters
+from ..lookups import authors, groups
 from ..models import Post, Group, User
 from ..settings import POSTS_PER_PAGE
+from ..timeline import rebuild_timeline
 
 SLUG_OF_GROUP = 'test_slug'
 SLUG_OF_GROUP_2 = 'test_slug2'
@@ -12,6 +20,8 @@ URL_OF_POSTS_OF_GROUP = reverse('posts:group_list', args=[SLUG_OF_GROUP])
 URL_OF_POSTS_OF_GROUP_2 = reverse('posts:group_list', args=[SLUG_OF_GROUP_2])
 URL_TO_CREATE_POST = reverse('posts:post_create')
 URL_OF_PROFILE = reverse('posts:profile', args=[USERNAME])
+# Запросов на страницу ленты: объект из URL, COUNT, страница постов.
+FEED_QUERIES_BUDGET = 4
 
 
 class PostPagesTests(TestCase):
@@ -39,6 +49,7 @@ class PostPagesTests(TestCase):
         cls.URL_TO_EDIT_POST = reverse('posts:post_edit', args=[cls.post.pk])
 
     def setUp(self):
+        cache.clear()
         self.guest_client = Client()
         self.authorized_client = Client()
         self.authorized_client.force_login(self.user)
@@ -100,8 +111,12 @@ class PaginatorViewsTest(TestCase):
             author=cls.user,
             group=cls.group)
             for number in range(POSTS_PER_PAGE + 1))
+        # bulk_create минует сигналы, поэтому счётчики и ленту пересчитываем.
+        rebuild_counters()
+        rebuild_timeline()
 
     def setUp(self):
+        cache.clear()
         self.guest_client = Client()
 
     def test_paginator(self):
@@ -120,3 +135,158 @@ class PaginatorViewsTest(TestCase):
                 self.assertEqual(
                     len(response.context.get('page_obj')), post_count
                 )
+
+    @patch('posts.paginators.APPROXIMATE_COUNT_THRESHOLD', POSTS_PER_PAGE)
+    def test_large_feed_count_is_approximate(self):
+        """Счёт большой ленты берётся из кэша, номера страниц не выводятся."""
+        response = self.client.get(URL_OF_INDEX)
+        self.assertFalse(response.context['page_obj'].paginator.is_approximate)
+        self.assertEqual(
+            cache.get('approximate-count:index'), Post.objects.count()
+        )
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(URL_OF_INDEX + '?page=2')
+        self.assertFalse(any(
+            'COUNT(' in query['sql'] for query in queries.captured_queries
+        ))
+        self.assertTrue(response.context['page_obj'].paginator.is_approximate)
+        self.assertEqual(len(response.context['page_obj']), 1)
+        self.assertContains(response, '2 из ~2')
+        self.assertNotContains(response, 'Последняя')
+
+    def test_page_links_are_windowed(self):
+        """Размер ответа не растёт вместе с числом страниц ленты."""
+        url = URL_OF_POSTS_OF_GROUP + '?page=2'
+        sizes = []
+        for pages in (10, 100):
+            Post.objects.bulk_create(
+                Post(text='Текст', author=self.user, group=self.group)
+                for _ in range(POSTS_PER_PAGE * pages)
+            )
+            rebuild_counters()
+            cache.clear()
+            response = self.client.get(url)
+            self.assertContains(response, 'class="page-item disabled"')
+            sizes.append(len(response.content))
+        self.assertLess(sizes[1] - sizes[0], 100)
+
+
+class CursorPaginatorViewsTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(
+            title='Test group',
+            slug=SLUG_OF_GROUP,
+            description='Тестовое описание',
+        )
+        Post.objects.bulk_create(Post(
+            text=f'Тестовый пост {number}',
+            author=cls.user,
+            group=cls.group)
+            for number in range(POSTS_PER_PAGE * 2 + 1))
+
+    def setUp(self):
+        cache.clear()
+
+    def walk(self, url):
+        pages = []
+        cursor = None
+        while True:
+            page = self.client.get(
+                url, {'cursor': cursor} if cursor else {}
+            ).context['page_obj']
+            pages.append(page)
+            if not page.has_next():
+                return pages
+            cursor = page.next_cursor
+
+    @patch('posts.views.CURSOR_PAGINATION', True)
+    def test_cursor_pages_cover_feed(self):
+        """Курсоры проходят ленту целиком без повторов и пропусков."""
+        expected = list(
+            Post.objects.order_by('-pub_date', '-pk').values_list(
+                'pk', flat=True
+            )
+        )
+        for url in [URL_OF_INDEX, URL_OF_POSTS_OF_GROUP, URL_OF_PROFILE]:
+            with self.subTest(url=url):
+                pages = self.walk(url)
+                self.assertEqual(
+                    [len(page) for page in pages],
+                    [POSTS_PER_PAGE, POSTS_PER_PAGE, 1]
+                )
+                self.assertEqual(
+                    [post.pk for page in pages for post in page], expected
+                )
+
+    @patch('posts.views.CURSOR_PAGINATION', True)
+    def test_previous_cursor(self):
+        first, second, last = self.walk(URL_OF_INDEX)
+        self.assertFalse(first.has_previous())
+        response = self.client.get(
+            URL_OF_INDEX, {'cursor': last.previous_cursor}
+        )
+        page = response.context['page_obj']
+        self.assertEqual(list(page), list(second))
+        self.assertTrue(page.has_previous())
+        self.assertTrue(page.has_next())
+
+    @patch('posts.views.CURSOR_PAGINATION', True)
+    def test_broken_cursor_gives_first_page(self):
+        response = self.client.get(URL_OF_INDEX, {'cursor': '!!!'})
+        page = response.context['page_obj']
+        self.assertEqual(len(page), POSTS_PER_PAGE)
+        self.assertFalse(page.has_previous())
+
+
+class FeedQueriesTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.user = User.objects.create_user(username=USERNAME)
+        cls.group = Group.objects.create(title='Заголовок', slug=SLUG_OF_GROUP)
+        cls.post = Post.objects.create(
+            author=cls.user,
+            text='Тестовая запись',
+            group=cls.group
+        )
+        cls.URL_OF_DETAIL_POST = reverse(
+            'posts:post_detail',
+            args=[cls.post.pk]
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def count_queries(self, url):
+        # Считаем запросы холодного процесса, без запомненных групп и авторов.
+        groups.clear()
+        authors.clear()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_feed_queries_do_not_depend_on_posts(self):
+        """Число запросов ленты не растёт вместе с числом постов."""
+        urls = [URL_OF_INDEX, URL_OF_POSTS_OF_GROUP, URL_OF_PROFILE]
+        before = {url: self.count_queries(url) for url in urls}
+        for number in range(POSTS_PER_PAGE):
+            author = User.objects.create_user(username=f'author{number}')
+            group = Group.objects.create(
+                title=f'Группа {number}', slug=f'group{number}'
+            )
+            Post.objects.create(author=author, text='Текст', group=group)
+            Post.objects.create(
+                author=self.user, text='Текст', group=self.group
+            )
+        for url in urls:
+            with self.subTest(url=url):
+                self.assertEqual(self.count_queries(url), before[url])
+                self.assertLessEqual(before[url], FEED_QUERIES_BUDGET)
+
+    def test_post_detail_queries(self):
+        self.assertLessEqual(
+            self.count_queries(self.URL_OF_DETAIL_POST), FEED_QUERIES_BUDGET
+        )
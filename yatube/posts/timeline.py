@@ -0,0 +1,131 @@
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from .models import Post, TimelineEntry
+from .settings import TIMELINE_SIZE
+
+ENTRY_FIELDS = ('pk', 'pub_date', 'author_id', 'group_id')
+
+
+def _entry(pk, pub_date, author_id, group_id):
+    return TimelineEntry(
+        post_id=pk, pub_date=pub_date, author_id=author_id, group_id=group_id
+    )
+
+
+def _trim():
+    """Удаляет записи старше TIMELINE_SIZE самых свежих."""
+    boundary = TimelineEntry.objects.values_list(
+        'pub_date', 'post_id'
+    )[TIMELINE_SIZE:TIMELINE_SIZE + 1].first()
+    if boundary is None:
+        return
+    pub_date, post_id = boundary
+    TimelineEntry.objects.filter(
+        Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, post_id__lte=post_id)
+    ).delete()
+
+
+def add_to_timeline(post):
+    try:
+        with transaction.atomic():
+            _entry(post.pk, post.pub_date, post.author_id, post.group_id).save(
+                force_insert=True
+            )
+    except IntegrityError:
+        # Запись уже есть: пост пересохранили с force_insert.
+        return
+    _trim()
+
+
+def sync_timeline(post_id):
+    """Приводит запись ленты к посту: добавляет, обновляет или удаляет.
+
+    Старый пост, добавленный в полную ленту, сразу уходит при обрезке.
+    """
+    row = Post.objects.filter(pk=post_id).values_list(*ENTRY_FIELDS).first()
+    if row is None:
+        TimelineEntry.objects.filter(post_id=post_id).delete()
+        refill_timeline()
+        return
+    pk, pub_date, author_id, group_id = row
+    if not TimelineEntry.objects.filter(post_id=pk).update(
+        author_id=author_id, group_id=group_id
+    ):
+        add_to_timeline(Post(
+            pk=pk, pub_date=pub_date, author_id=author_id, group_id=group_id
+        ))
+
+
+def refill_timeline():
+    """Добирает в ленту следующий по давности пост после удаления."""
+    if TimelineEntry.objects.count() >= TIMELINE_SIZE:
+        return
+    oldest = TimelineEntry.objects.order_by(
+        'pub_date', 'post_id'
+    ).values_list('pub_date', 'post_id').first()
+    posts = Post.objects.order_by('-pub_date', '-id')
+    if oldest is not None:
+        pub_date, post_id = oldest
+        posts = posts.filter(
+            Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=post_id)
+        )
+    row = posts.values_list(*ENTRY_FIELDS).first()
+    if row is not None:
+        TimelineEntry.objects.bulk_create([_entry(*row)])
+
+
+def timeline_accepts(pub_date):
+    """Попадёт ли в ленту пост с такой датой публикации.
+
+    Попадёт, если лента не заполнена или он не старше её последней записи.
+    """
+    if TimelineEntry.objects.count() < TIMELINE_SIZE:
+        return True
+    oldest = TimelineEntry.objects.order_by('pub_date').values_list(
+        'pub_date', flat=True
+    ).first()
+    return pub_date >= oldest
+
+
+@transaction.atomic
+def rebuild_timeline():
+    """Заполняет ленту заново по таблице постов."""
+    TimelineEntry.objects.all().delete()
+    TimelineEntry.objects.bulk_create(
+        _entry(*row) for row in Post.objects.order_by(
+            '-pub_date', '-id'
+        ).values_list(*ENTRY_FIELDS)[:TIMELINE_SIZE]
+    )
+
+
+class TimelineFeed:
+    """Общая лента для Paginator, читающая первые страницы из TimelineEntry.
+
+    Номера постов страницы берутся узким запросом по индексу ленты, сами
+    посты — одним запросом по первичному ключу. Страницы глубже
+    TIMELINE_SIZE читаются из таблицы постов как обычно. Сигналы сюда не
+    доходят при bulk_create, поэтому массовая загрузка пересобирает ленту
+    в транзакции каждой пачки (см. posts_import).
+    """
+
+    def __init__(self, posts):
+        self.posts = posts
+
+    def count(self):
+        return self.posts.count()
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, page):
+        if page.stop <= page.start:
+            return []
+        if page.stop <= TIMELINE_SIZE:
+            ids = list(TimelineEntry.objects.values_list(
+                'post_id', flat=True
+            )[page])
+            if len(ids) == page.stop - page.start:
+                posts = self.posts.in_bulk(ids)
+                return [posts[pk] for pk in ids if pk in posts]
+        return list(self.posts[page])
@@ -1,43 +1,97 @@
+from urllib.parse import urlencode
+
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
+from django.db import transaction
 from django.shortcuts import render, get_object_or_404, redirect
 
+from core.sqlite import serialized_writes
 
+from .cache import GROUPS, INDEX, author_scope, cache_feed, group_scope
+from .conditional import feed_condition, post_condition
+from .counters import author_post_count, group_post_count
+from .editing import (
+    EDIT_CONFLICT, post_state, save_post_edit, sign_state, unsign_state
+)
 from .forms import PostForm
-from .models import Post, Group, User
-from .settings import POSTS_PER_PAGE
-
-
-def page_paginator(posts, count_pages, request):
-    return Paginator(posts, count_pages).get_page(request.GET.get('page'))
+from .lookups import get_author, get_group
+from .models import Post
+from .paginators import (
+    ApproximateCountPaginator, CountedPaginator, CursorPaginator,
+    WindowedPaginator
+)
+from .search import SearchResults
+from .settings import CURSOR_PAGINATION, POSTS_PER_PAGE
+from .timeline import TimelineFeed
+
+
+def page_paginator(posts, count_pages, request, count=None):
+    if CURSOR_PAGINATION:
+        return CursorPaginator(posts, count_pages).get_page(
+            request.GET.get('cursor')
+        )
+    if count is None:
+        # Общая лента: страницы из TimelineFeed, счёт — по таблице постов.
+        paginator = ApproximateCountPaginator(
+            TimelineFeed(posts), count_pages, posts, INDEX
+        )
+    else:
+        paginator = CountedPaginator(posts, count_pages, count)
+    return paginator.get_page(request.GET.get('page'))
 
 
+@feed_condition(INDEX, GROUPS)
+@cache_feed(INDEX, GROUPS)
 def index(request):
     return render(request, 'posts/index.html', {
-        'page_obj': page_paginator(Post.objects.all(), POSTS_PER_PAGE, request)
+        'page_obj': page_paginator(
+            Post.objects.feed(), POSTS_PER_PAGE, request
+        )
     })
 
 
+@feed_condition(group_scope)
+@cache_feed(group_scope)
 def group_posts(request, slug):
-    group = get_object_or_404(Group, slug=slug)
+    group = get_group(slug)
     return render(request, 'posts/group_list.html', {
         'group': group,
-        'page_obj': page_paginator(group.posts.all(), POSTS_PER_PAGE, request)
+        'page_obj': page_paginator(
+            group.posts.feed(), POSTS_PER_PAGE, request,
+            count=group_post_count(group.pk)
+        )
     })
 
 
+@feed_condition(author_scope, GROUPS)
+@cache_feed(author_scope, GROUPS)
 def profile(request, username):
-    author = get_object_or_404(User, username=username)
+    author = get_author(username)
+    post_count = author_post_count(author.pk)
     return render(request, 'posts/profile.html', {
         'author': author,
+        'post_count': post_count,
         'page_obj': page_paginator(
-            author.posts.select_related('group'), POSTS_PER_PAGE, request
+            author.posts.feed(), POSTS_PER_PAGE, request, count=post_count
         )})
 
 
+def search(request):
+    query = request.GET.get('q', '').strip()
+    return render(request, 'posts/search.html', {
+        'query': query,
+        'page_query': urlencode({'q': query}) + '&',
+        'page_obj': WindowedPaginator(
+            SearchResults(query), POSTS_PER_PAGE
+        ).get_page(request.GET.get('page'))
+    })
+
+
+@post_condition
 def post_detail(request, post_id):
+    post = get_object_or_404(Post.objects.feed(), pk=post_id)
     return render(request, 'posts/post_detail.html', {
-        'post': get_object_or_404(Post, pk=post_id)
+        'post': post,
+        'post_count': author_post_count(post.author_id)
     })
 
 
@@ -48,21 +102,48 @@ def post_create(request):
         return render(request, 'posts/create_post.html', {'form': form})
     post = form.save(commit=False)
     post.author = request.user
-    post.save()
+    # Пост и задачи его сигналов фиксируются вместе; очередь писателей
+    # держится только на время этой транзакции.
+    with serialized_writes(), transaction.atomic():
+        post.save()
     return redirect('posts:profile', username=str(request.user))
 
 
 @login_required
 def post_edit(request, post_id):
+    if request.method != 'POST':
+        post = get_object_or_404(Post, id=post_id)
+        if request.user != post.author:
+            return redirect('posts:post_detail', post_id=post.id)
+        return render(request, 'posts/create_post.html', {
+            'form': PostForm(instance=post),
+            'is_edit': True,
+            'edit_state': sign_state(post),
+        })
+    form = PostForm(request.POST)
+    if form.is_valid():
+        state = unsign_state(request.POST.get('edit_state', ''))
+        if state is None:
+            # Форма без состояния: правим поверх текущей версии.
+            post = get_object_or_404(Post, id=post_id)
+            state = post_state(post)
+        if save_post_edit(
+            post_id, request.user.pk, state, **form.cleaned_data
+        ):
+            return redirect('posts:post_detail', post_id=post_id)
+    # Ошибки формы и конфликт показываем только автору существующего поста.
     post = get_object_or_404(Post, id=post_id)
     if request.user != post.author:
         return redirect('posts:post_detail', post_id=post.id)
-    form = PostForm(request.POST or None, instance=post)
     if not form.is_valid():
-        return render(
-            request,
-            'posts/create_post.html',
-            {'form': form, 'is_edit': True}
-        )
-    form.save()
-    return redirect('posts:post_detail', post_id=post.id)
+        return render(request, 'posts/create_post.html', {
+            'form': form,
+            'is_edit': True,
+            'edit_state': request.POST.get('edit_state', ''),
+        })
+    form.add_error(None, EDIT_CONFLICT)
+    return render(request, 'posts/create_post.html', {
+        'form': form,
+        'is_edit': True,
+        'edit_state': sign_state(post),
+    }, status=409)
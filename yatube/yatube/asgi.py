@@ -0,0 +1,16 @@
+"""
+ASGI config for yatube project.
+
+It exposes the ASGI callable as a module-level variable named ``application``.
+
+Django 2.2 has no ASGI handler of its own, see core.asgi.AsgiHandler.
+Like the WSGI entry point, it defaults to the production settings.
+"""
+
+import os
+
+from core.asgi import AsgiHandler
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings_production')
+
+application = AsgiHandler()
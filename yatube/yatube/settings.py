@@ -23,7 +23,6 @@ ALLOWED_HOSTS = [
 ]
 
 TEMPLATES_DIR = os.path.join(BASE_DIR, 'templates')
-print(TEMPLATES_DIR)
 
 # Application definition
 
@@ -41,11 +40,13 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'core.middleware.StickyPrimaryMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -54,7 +55,7 @@ ROOT_URLCONF = 'yatube.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.templates.DjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -69,8 +70,26 @@ TEMPLATES = [
     },
 ]
 
+# Компилировать ли все шаблоны при старте процесса (см. settings_production).
+WARM_TEMPLATES = False
+
 WSGI_APPLICATION = 'yatube.wsgi.application'
 
+# Представления, которые только читают: для них ASGI берёт потоки из
+# пула чтения, а ReplicaRouter — реплики базы.
+READ_ONLY_VIEWS = [
+    'posts:index',
+    'posts:group_list',
+    'posts:profile',
+    'posts:post_detail',
+    'about:author',
+    'about:tech',
+]
+
+# ASGI: потоки для представлений только на чтение и для всех остальных.
+ASGI_READ_THREADS = 32
+ASGI_WRITE_THREADS = 4
+
 # Database
 # https://docs.djangoproject.com/en/2.2/ref/settings/#databases
 
@@ -81,6 +100,85 @@ DATABASES = {
     }
 }
 
+# Псевдонимы баз-реплик из DATABASES для READ_ONLY_VIEWS, см. core.routers.
+DATABASE_REPLICAS = []
+DATABASE_ROUTERS = ['core.routers.ReplicaRouter']
+# Сколько секунд после записи сессия читает только из основной базы.
+REPLICA_STICKY_SECONDS = 15
+
+# Выполняются на каждом новом соединении SQLite, см. core.sqlite.
+SQLITE_PRAGMAS = {}
+# Настройки для нагруженного SQLite (settings_production, bench_sqlite).
+# WAL: читатели не ждут писателя. NORMAL в WAL не теряет целостность,
+# а fsync делает только на контрольных точках.
+SQLITE_WAL_PRAGMAS = {
+    'journal_mode': 'wal',
+    'synchronous': 'normal',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,
+    'busy_timeout': 5000,
+}
+
+# Tasks
+# Отложенные задачи core.tasks. В разработке и тестах они выполняются
+# сразу, в settings_production — потоком процесса после фиксации.
+TASKS_EAGER = True
+TASKS_MAX_ATTEMPTS = 5
+# Пауза перед повтором: TASKS_RETRY_SECONDS * 2 ** (попытка - 1).
+TASKS_RETRY_SECONDS = 10
+# Сколько задача принадлежит взявшему её процессу; потом её возьмёт другой.
+TASKS_LEASE_SECONDS = 60
+TASKS_POLL_SECONDS = 5
+TASKS_BATCH_SIZE = 100
+
+# Cache
+# https://docs.djangoproject.com/en/2.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Metrics
+# Доля запросов, для которых RequestMetricsMiddleware снимает замеры.
+METRICS_SAMPLE_RATE = 0.1
+# Токен для сборщика метрик: Authorization: Bearer <токен>. Без него
+# /metrics/ открыт только сотрудникам.
+METRICS_TOKEN = None
+
+# Slow queries
+# Запросы дольше порога пишутся с EXPLAIN в журнал slow_queries.log,
+# сводку по нему строит manage.py slow_queries_report.
+SLOW_QUERY_THRESHOLD_MS = 100
+SLOW_QUERY_LOG = os.path.join(BASE_DIR, 'slow_queries.log')
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'slow_queries': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'encoding': 'utf-8',
+            'delay': True,
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'yatube.slow_queries': {
+            'handlers': ['slow_queries'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
+
 # Password validation
 # https://docs.djangoproject.com/en/2.2/ref/settings/#auth-password-validators
 
@@ -0,0 +1,143 @@
+"""
+Production settings for yatube project.
+
+Everything that differs between deployments comes from the environment:
+
+    DJANGO_SECRET_KEY      обязательно
+    DJANGO_DEBUG           1 — включить отладку, по умолчанию выключена
+    DJANGO_ALLOWED_HOSTS   хосты через запятую
+    DJANGO_DB_ENGINE       по умолчанию django.db.backends.sqlite3
+    DJANGO_DB_NAME         имя базы или путь к файлу SQLite
+    DJANGO_DB_USER, DJANGO_DB_PASSWORD, DJANGO_DB_HOST, DJANGO_DB_PORT
+    DJANGO_DB_CONN_MAX_AGE секунды жизни соединения, по умолчанию 60
+    DJANGO_DB_REPLICAS     реплики через запятую: файлы SQLite или хосты
+    DJANGO_DB_POOL_SIZE    если задан — пул соединений такого размера
+                           на базу в каждом процессе, см. core.db
+    DJANGO_DB_POOL_TIMEOUT секунды ожидания соединения из пула, по
+                           умолчанию 5
+    DJANGO_METRICS_TOKEN   токен сборщика метрик для /metrics/
+    DJANGO_CACHE_BACKEND   общий для процессов кэш, по умолчанию
+                           django.core.cache.backends.filebased.FileBasedCache;
+                           LocMemCache запрещён
+    DJANGO_CACHE_LOCATION  каталог или адрес кэша, по умолчанию
+                           <BASE_DIR>/cache
+
+SQLite runs in WAL mode, and write transactions of posts are serialized
+per process by core.sqlite.serialized_writes.
+
+Side effects of writes (post counters, the timeline, feed caches) run as
+core.tasks in a background thread of each process, not in the request.
+
+Templates are compiled once per process by the cached loader and warmed up
+on start, see core.templates.warm_templates.
+"""
+
+import os
+from copy import deepcopy
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401,F403
+from .settings import (
+    BASE_DIR, SQLITE_WAL_PRAGMAS, TEMPLATES as DEVELOPMENT_TEMPLATES
+)
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Задайте переменную DJANGO_SECRET_KEY.')
+
+DEBUG = os.environ.get('DJANGO_DEBUG') == '1'
+
+ALLOWED_HOSTS = [
+    host.strip()
+    for host in os.environ.get('DJANGO_ALLOWED_HOSTS', 'localhost').split(',')
+    if host.strip()
+]
+
+DATABASES = {
+    'default': {
+        'ENGINE': os.environ.get(
+            'DJANGO_DB_ENGINE', 'django.db.backends.sqlite3'
+        ),
+        'NAME': os.environ.get(
+            'DJANGO_DB_NAME', os.path.join(BASE_DIR, 'db.sqlite3')
+        ),
+        'USER': os.environ.get('DJANGO_DB_USER', ''),
+        'PASSWORD': os.environ.get('DJANGO_DB_PASSWORD', ''),
+        'HOST': os.environ.get('DJANGO_DB_HOST', ''),
+        'PORT': os.environ.get('DJANGO_DB_PORT', ''),
+        'CONN_MAX_AGE': int(os.environ.get('DJANGO_DB_CONN_MAX_AGE', 60)),
+    }
+}
+
+# Реплика — копия default с другим файлом SQLite или хостом.
+DATABASE_REPLICAS = []
+REPLICA_LOCATION = (
+    'NAME' if DATABASES['default']['ENGINE'].endswith('sqlite3') else 'HOST'
+)
+for location in os.environ.get('DJANGO_DB_REPLICAS', '').split(','):
+    if location.strip():
+        replica = f'replica{len(DATABASE_REPLICAS) + 1}'
+        DATABASES[replica] = {
+            **DATABASES['default'],
+            REPLICA_LOCATION: location.strip(),
+            'TEST': {'MIRROR': 'default'},
+        }
+        DATABASE_REPLICAS.append(replica)
+
+# С пулом Django закрывает соединение после каждого запроса
+# (CONN_MAX_AGE = 0), а пул возвращает его себе и выдаёт следующему
+# потоку. Без пула каждый поток держит своё соединение CONN_MAX_AGE
+# секунд, и соединений с базой столько, сколько потоков.
+POOLED_ENGINES = {
+    'django.db.backends.sqlite3': 'core.db.backends.sqlite3',
+    'django.db.backends.postgresql': 'core.db.backends.postgresql',
+}
+if os.environ.get('DJANGO_DB_POOL_SIZE'):
+    for database in DATABASES.values():
+        database['ENGINE'] = POOLED_ENGINES.get(
+            database['ENGINE'], database['ENGINE']
+        )
+        database['CONN_MAX_AGE'] = 0
+        database['POOL'] = {
+            'MAX_SIZE': int(os.environ['DJANGO_DB_POOL_SIZE']),
+            'TIMEOUT': float(os.environ.get('DJANGO_DB_POOL_TIMEOUT', 5)),
+        }
+
+# Поколения и ETag лент, окно чтения из основной базы после записи и
+# запомненный счёт ленты должны видеть все процессы. LocMemCache у каждого
+# процесса свой: ленты расходились бы, а старые ETag получали бы 304.
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get(
+            'DJANGO_CACHE_BACKEND',
+            'django.core.cache.backends.filebased.FileBasedCache'
+        ),
+        'LOCATION': os.environ.get(
+            'DJANGO_CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')
+        ),
+    }
+}
+if CACHES['default']['BACKEND'].endswith('.LocMemCache'):
+    raise ImproperlyConfigured(
+        'LocMemCache не общий для процессов: задайте DJANGO_CACHE_BACKEND.'
+    )
+
+METRICS_TOKEN = os.environ.get('DJANGO_METRICS_TOKEN')
+
+SQLITE_PRAGMAS = SQLITE_WAL_PRAGMAS
+
+TASKS_EAGER = False
+
+TEMPLATES = deepcopy(DEVELOPMENT_TEMPLATES)
+TEMPLATES[0]['APP_DIRS'] = False
+TEMPLATES[0]['OPTIONS']['debug'] = DEBUG
+TEMPLATES[0]['OPTIONS']['loaders'] = [
+    ('django.template.loaders.cached.Loader', [
+        'django.template.loaders.filesystem.Loader',
+        'django.template.loaders.app_directories.Loader',
+    ]),
+]
+# Скомпилировать все шаблоны при старте процесса, а не на первых запросах.
+WARM_TEMPLATES = True
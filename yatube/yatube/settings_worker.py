@@ -0,0 +1,16 @@
+"""
+Settings for public worker nodes of yatube project.
+
+Production settings without the admin: its app, autodiscovered admin
+modules and templates are never loaded, so workers start faster. The admin
+is served by nodes running settings_production.
+"""
+
+from .settings_production import *  # noqa: F401,F403
+from .settings_production import INSTALLED_APPS
+
+INSTALLED_APPS = [
+    app for app in INSTALLED_APPS if app != 'django.contrib.admin'
+]
+
+ROOT_URLCONF = 'yatube.urls_worker'
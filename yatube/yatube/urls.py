@@ -1,11 +1,10 @@
 from django.contrib import admin
-from django.urls import include, path
+from django.urls import path
+
+from .urls_worker import urlpatterns as public_urlpatterns
 
 
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('auth/', include('users.urls')),
-    path('auth/', include('django.contrib.auth.urls')),
-    path('about/', include('about.urls', namespace='about')),
-    path('', include('posts.urls', namespace='posts')),
+    *public_urlpatterns,
 ]
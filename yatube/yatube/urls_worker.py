@@ -0,0 +1,15 @@
+"""URL-схема публичных узлов: всё, кроме админки.
+
+Модули админки на таких узлах не импортируются, см. settings_worker.
+"""
+from django.urls import include, path
+
+from core.views import metrics
+
+urlpatterns = [
+    path('auth/', include('users.urls')),
+    path('auth/', include('django.contrib.auth.urls')),
+    path('metrics/', metrics, name='metrics'),
+    path('about/', include('about.urls', namespace='about')),
+    path('', include('posts.urls', namespace='posts')),
+]
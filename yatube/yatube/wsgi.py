@@ -2,6 +2,9 @@
 WSGI config for yatube project.
 
 It exposes the WSGI callable as a module-level variable named ``application``.
+Deployments use the production settings unless DJANGO_SETTINGS_MODULE says
+otherwise; they compile all templates before serving requests and start
+the process's background task worker.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/2.2/howto/deployment/wsgi/
@@ -11,6 +14,14 @@ import os
 
 from django.core.wsgi import get_wsgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings')
+from core.templates import warm_templates
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yatube.settings_production')
 
 application = get_wsgi_application()
+warm_templates()
+
+# Модели core.tasks доступны только после настройки Django.
+from core.tasks import start_worker  # noqa: E402
+
+start_worker()